@@ -1,7 +1,13 @@
-from flask import Flask, request, Response, jsonify
+from flask import Flask, request, Response, jsonify, g
 from datetime import datetime, timezone
-import random
+from fnmatch import fnmatchcase
+from threading import Lock
+import numpy as np
+import argparse
+import hashlib
 import json
+import time
+import zlib
 
 app = Flask(__name__)
 app.config["JSON_SORT_KEYS"] = False  # Disable key sorting in JSON responses
@@ -64,76 +70,765 @@ def taglist():
     json_data = json.dumps(dummy_tags, sort_keys=False)
     return Response(json_data, mimetype='application/json')
 
+DATE_FORMATS = ("iso", "unix", "epoch_ms")
+LAYOUTS = ("records", "columnar")
+
+@app.route('/capabilities', methods=['GET'])
+def capabilities():
+    """
+    Advertises the optional wire formats so clients can pick the cheapest one.
+    """
+    return jsonify({
+        "dateFormats": list(DATE_FORMATS),
+        "layouts": list(LAYOUTS),
+        "batch": True
+    })
+
+DEFAULT_START = int(datetime(2025, 2, 19, 0, 0, 0, tzinfo=timezone.utc).timestamp())
+DEFAULT_END = int(datetime(2025, 2, 25, 0, 0, 0, tzinfo=timezone.utc).timestamp())
+DEFAULT_STEP_MS = 45000  # sample period; the load profile and ?step=<seconds> override
+DEFAULT_SEED = 0         # ?seed= overrides; same (tag, grid ms, seed) => same sample
+STREAM_CHUNK = 20000     # samples serialized per streamed chunk
+GENERATOR_VERSION = 3    # part of every ETag: bump when generated data changes
+
+###############################################################################
+# TAG PROFILES
+###############################################################################
+# kind "int": uniform integers in [low, high]; "float": uniform in [low, high]
+# rounded to `decimals`; "bool": 0/1.
+PROFILE_OVERRIDES = {
+    "Hybrid.ESS.MaxCellVoltage": {"kind": "int", "low": 3330, "high": 3340},
+    "Hybrid.ESS.MinCellVoltage": {"kind": "int", "low": 3300, "high": 3320},
+    "Hybrid.ESS.AverageCellVoltage": {"kind": "int", "low": 3320, "high": 3330},
+    "Sensor.Temperature": {"kind": "float", "low": 15, "high": 25, "decimals": 2},
+    "Sensor.Pressure": {"kind": "float", "low": 980, "high": 1020, "decimals": 2},
+    "Sensor.Humidity": {"kind": "float", "low": 40, "high": 60, "decimals": 2},
+    "Machine.Speed": {"kind": "float", "low": 1400, "high": 1600, "decimals": 2},
+    "Machine.Temperature": {"kind": "float", "low": 70, "high": 90, "decimals": 2},
+    "Generator.PowerOutput": {"kind": "float", "low": 50, "high": 150, "decimals": 2},
+    "Generator.FuelConsumption": {"kind": "float", "low": 0.5, "high": 5.0, "decimals": 2},
+    "EXT.SignalStrength": {"kind": "int", "low": 1, "high": 100},
+    "EXT.SystemVoltage": {"kind": "int", "low": 210, "high": 240},
+}
+# value range by engineering unit for the taglist entries
+UNIT_RANGES = {
+    "A": (0, 500), "Aac": (0, 500),
+    "V": (380, 420), "Vac": (380, 420),
+    "kW": (0, 250), "kVAr": (-50, 50),
+    "deg. C": (15, 95),
+}
+DEFAULT_PROFILE = {"kind": "int", "low": 0, "high": 100}
+
+def build_profile(tag_info):
+    """
+    Profile for one taglist entry from its RegisterDataType and Unit.
+    """
+    low, high = UNIT_RANGES.get(tag_info.get("Unit"), (0, 100))
+    dtype = tag_info.get("RegisterDataType")
+    if dtype == "Boolean":
+        return {"kind": "bool"}
+    if dtype in ("UInt16", "UInt32"):
+        return {"kind": "int", "low": max(0, low), "high": high}
+    return {"kind": "float", "low": low, "high": high, "decimals": 2}
+
+TAG_PROFILES = {t["Tag"]: build_profile(t) for t in dummy_tags}
+TAG_PROFILES.update(PROFILE_OVERRIDES)
+
+def tag_profile(tag):
+    return TAG_PROFILES.get(tag, DEFAULT_PROFILE)
+
+###############################################################################
+# LOAD PROFILE (production-like latency, errors, sample rates; see --help)
+###############################################################################
+# Every section is off by default. Rates are probabilities per request
+# (errors, timeouts), per gap slot of max_s seconds (gaps) or per sample
+# (out_of_order). Sample periods are per tag, by fnmatch pattern, in ms.
+DEFAULT_LOAD_PROFILE = {
+    "seed": 0,  # seeds the latency/error/stall draws
+    "endpoints": ["values", "values_batch"],
+    # dist: none | fixed (ms) | uniform (ms +- spread) | normal (mean ms, sd spread)
+    #       | lognormal (median ms, sigma spread)
+    "latency": {"dist": "none", "ms": 0, "spread": 0, "max_ms": 60000},
+    "bandwidth": {"request_kBps": 0, "total_kBps": 0},  # 0 => unlimited
+    "errors": {"rate": 0.0, "statuses": [500, 503], "retry_after_s": 1},
+    # where: "headers" stalls before answering, "body" after the first chunk
+    "timeouts": {"rate": 0.0, "stall_s": 30, "where": "headers"},
+    "sample_rates": {"default_ms": DEFAULT_STEP_MS, "tags": {}},
+    "gaps": {"rate": 0.0, "min_s": 300, "max_s": 3600},
+    "out_of_order": {"rate": 0.0, "max_shift": 3},
+}
+LATENCY_DISTS = ("none", "fixed", "uniform", "normal", "lognormal")
+MIN_STEP_MS, MAX_STEP_MS = 1, 86400000
+
+LOAD_PROFILE = None
+LOAD_RNG = None
+LOAD_RNG_LOCK = Lock()
+TOTAL_THROTTLE = None
+DATA_FINGERPRINT = ""  # profile fields that change the samples, part of every ETag
+
+def merge_profile(base, override):
+    """
+    base with override's keys replaced, one level deep for section dicts.
+    """
+    out = {k: dict(v) if isinstance(v, dict) else v for k, v in base.items()}
+    for k, v in (override or {}).items():
+        if k not in base:
+            raise ValueError(f"unknown load profile section {k!r}")
+        if isinstance(base[k], dict):
+            if not isinstance(v, dict):
+                raise ValueError(f"load profile section {k!r} must be an object")
+            out[k].update(v)
+        else:
+            out[k] = v
+    return out
+
+def check_profile(p):
+    if p["latency"]["dist"] not in LATENCY_DISTS:
+        raise ValueError(f"latency.dist must be one of {', '.join(LATENCY_DISTS)}")
+    for sec in ("errors", "timeouts", "gaps", "out_of_order"):
+        if not 0.0 <= float(p[sec]["rate"]) <= 1.0:
+            raise ValueError(f"{sec}.rate must be within [0, 1]")
+    if float(p["errors"]["rate"]) + float(p["timeouts"]["rate"]) > 1.0:
+        raise ValueError("errors.rate + timeouts.rate must not exceed 1")
+    if p["timeouts"]["where"] not in ("headers", "body"):
+        raise ValueError("timeouts.where must be 'headers' or 'body'")
+    if not p["errors"]["statuses"]:
+        raise ValueError("errors.statuses must not be empty")
+    rates = p["sample_rates"]
+    for ms in [rates["default_ms"]] + list(rates["tags"].values()):
+        if not MIN_STEP_MS <= int(ms) <= MAX_STEP_MS:
+            raise ValueError(f"sample period {ms} ms outside [{MIN_STEP_MS}, {MAX_STEP_MS}]")
+    if not 0 < int(p["gaps"]["min_s"]) <= int(p["gaps"]["max_s"]):
+        raise ValueError("gaps need 0 < min_s <= max_s")
+    if int(p["out_of_order"]["max_shift"]) < 1:
+        raise ValueError("out_of_order.max_shift must be >= 1")
+
+def set_load_profile(override=None):
+    """
+    Activates DEFAULT_LOAD_PROFILE merged with override; raises ValueError.
+    """
+    global LOAD_PROFILE, LOAD_RNG, TOTAL_THROTTLE, DATA_FINGERPRINT
+    p = merge_profile(DEFAULT_LOAD_PROFILE, override)
+    check_profile(p)
+    LOAD_PROFILE = p
+    LOAD_RNG = np.random.default_rng(p["seed"])
+    total = float(p["bandwidth"]["total_kBps"])
+    TOTAL_THROTTLE = Throttle(total * 1000) if total > 0 else None
+    data = {k: p[k] for k in ("gaps", "out_of_order")}
+    DATA_FINGERPRINT = hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+
+def tag_step_ms(tag):
+    """
+    Sample period of tag: the first matching sample_rates.tags pattern, else default_ms.
+    """
+    rates = LOAD_PROFILE["sample_rates"]
+    for pattern, ms in rates["tags"].items():
+        if fnmatchcase(str(tag), pattern):
+            return int(ms)
+    return int(rates["default_ms"])
+
+def draw_uniform():
+    with LOAD_RNG_LOCK:
+        return float(LOAD_RNG.random())
+
+def draw_latency():
+    """
+    One request latency in seconds from the profile's distribution.
+    """
+    lat = LOAD_PROFILE["latency"]
+    dist, ms, spread = lat["dist"], float(lat["ms"]), float(lat["spread"])
+    with LOAD_RNG_LOCK:
+        if dist == "none":
+            return 0.0
+        if dist == "fixed":
+            v = ms
+        elif dist == "uniform":
+            v = LOAD_RNG.uniform(ms - spread, ms + spread)
+        elif dist == "normal":
+            v = LOAD_RNG.normal(ms, spread)
+        else:
+            v = ms * np.exp(LOAD_RNG.normal(0.0, spread))
+    return min(max(v, 0.0), float(lat["max_ms"])) / 1000.0
+
+class Throttle:
+    """
+    Byte-rate limiter shared by its callers: reserve(n) books n bytes on the
+    link and returns how long to wait until they have been sent.
+    """
+    def __init__(self, bytes_per_s):
+        self.rate = bytes_per_s
+        self.next = time.monotonic()
+        self.lock = Lock()
+
+    def reserve(self, n):
+        with self.lock:
+            now = time.monotonic()
+            self.next = max(now, self.next) + n / self.rate
+            return self.next - now
+
+set_load_profile()
+
+###############################################################################
+# SERIES GENERATION (stateless: every sample is a hash of tag, grid ms and seed)
+###############################################################################
+GOLDEN64 = 0x9E3779B97F4A7C15
+
+def mix64(x):
+    """
+    splitmix64 finalizer over a uint64 array (arithmetic wraps mod 2**64).
+    """
+    x = x ^ (x >> 30)
+    x = x * 0xBF58476D1CE4E5B9
+    x = x ^ (x >> 27)
+    x = x * 0x94D049BB133111EB
+    return x ^ (x >> 31)
+
+def tag_key(tag, seed):
+    key = (int(seed) * GOLDEN64 + zlib.crc32(str(tag).encode("utf-8"))) & 0xFFFFFFFFFFFFFFFF
+    return mix64(np.array([key], dtype=np.uint64))[0]
+
+def sample_grid(start_ts, end_ts, step_ms):
+    """
+    Samples sit on the epoch-aligned grid of multiples of `step_ms`, so
+    overlapping requests share them. Returns (first grid ms at/after
+    start_ts, number of grid points up to end_ts inclusive).
+    """
+    first = -(-start_ts * 1000 // step_ms) * step_ms
+    return first, max(0, (end_ts * 1000 - first) // step_ms + 1)
+
+def sample_values(profile, h):
+    """
+    Values for the uint64 hashes h: the top 53 bits as a uniform [0, 1).
+    """
+    kind = profile["kind"]
+    if kind == "bool":
+        return (h >> 63).astype(np.int64)
+    u = unit_floats(h)
+    if kind == "int":
+        return profile["low"] + (u * (profile["high"] - profile["low"] + 1)).astype(np.int64)
+    return np.round(profile["low"] + u * (profile["high"] - profile["low"]), profile.get("decimals", 2))
+
+def unit_floats(h):
+    return (h >> 11).astype(np.float64) * 2.0 ** -53
+
+def in_gaps(key, grid):
+    """
+    Whether each grid ms falls in a gap: time is cut into slots of
+    gaps.max_s, and a `rate` fraction of the slots (picked by hash) lose
+    min_s..max_s seconds at a hashed offset.
+    """
+    gaps = LOAD_PROFILE["gaps"]
+    slot_ms = int(gaps["max_s"]) * 1000
+    min_ms = int(gaps["min_s"]) * 1000
+    slot = grid // slot_ms
+    h = mix64(slot.astype(np.uint64) * GOLDEN64 + (key ^ 0x6A09E667F3BCC909))
+    length = min_ms + (mix64(h) % (slot_ms - min_ms + 1)).astype(np.int64)
+    start = slot * slot_ms + (mix64(h ^ 0x3C6EF372FE94F82B) % (slot_ms - length + 1).astype(np.uint64)).astype(np.int64)
+    return (unit_floats(h) < float(gaps["rate"])) & (grid >= start) & (grid < start + length)
+
+def shuffled_order(h):
+    """
+    Emission order with an out_of_order `rate` fraction of the samples
+    (picked by their hashes h) sent 1..max_shift positions late.
+    """
+    ooo = LOAD_PROFILE["out_of_order"]
+    hs = mix64(h ^ 0xBB67AE8584CAA73B)
+    late = unit_floats(hs) < float(ooo["rate"])
+    shift = 1 + (mix64(hs) % int(ooo["max_shift"])).astype(np.int64)
+    return np.argsort(np.arange(len(h)) + late * (shift + 0.5), kind="stable")
+
+def generate_series(tag, first, n, step_ms=DEFAULT_STEP_MS, seed=DEFAULT_SEED):
+    """
+    Returns (ts_ms, values) numpy arrays for the n grid points starting at
+    grid ms `first`. Jitter (under a second, and under step_ms) and value
+    depend only on (tag, grid ms, seed): any range hitting that grid point
+    returns the same sample. The load profile's gaps drop samples and its
+    out_of_order setting permutes them, both deterministically.
+    """
+    grid = first + np.arange(n, dtype=np.int64) * step_ms
+    key = tag_key(tag, seed)
+    h = mix64(grid.astype(np.uint64) * GOLDEN64 + key)
+    ts_ms = grid + (h % min(step_ms, 1000)).astype(np.int64)
+    vals = sample_values(tag_profile(tag), mix64(h))
+    if LOAD_PROFILE["gaps"]["rate"]:
+        keep = ~in_gaps(key, grid)
+        ts_ms, vals, h = ts_ms[keep], vals[keep], h[keep]
+    if LOAD_PROFILE["out_of_order"]["rate"]:
+        order = shuffled_order(h)
+        ts_ms, vals = ts_ms[order], vals[order]
+    return ts_ms, vals
+
+def series_etag(tag, first, n, step_ms, seed):
+    """
+    Weak ETag (same samples, any dateFormat/layout) for n grid points from grid ms `first`.
+    """
+    key = repr((GENERATOR_VERSION, DATA_FINGERPRINT, tag, first, n, step_ms, seed)).encode("utf-8")
+    return hashlib.sha1(key).hexdigest()[:24]
+
+def sample_range(header, n):
+    """
+    (lo, hi) inclusive sample indices from a `Range: samples=lo-hi` header
+    ("lo-" => to the end, "-k" => the last k), or None for the whole series
+    (no header, another unit, or malformed, which HTTP says to ignore).
+    Raises ValueError when the range selects nothing.
+    """
+    if not header or not header.strip().startswith("samples="):
+        return None
+    spec = header.strip()[len("samples="):]
+    if "," in spec or "-" not in spec:
+        return None
+    a, b = (p.strip() for p in spec.split("-", 1))
+    if (a and not a.isdigit()) or (b and not b.isdigit()) or not (a or b) or (a and b and int(b) < int(a)):
+        return None
+    if a:
+        lo, hi = int(a), min(int(b), n - 1) if b else n - 1
+    else:
+        lo, hi = max(n - int(b), 0), n - 1 if int(b) else -1
+    if lo >= n or hi < lo:
+        raise ValueError("unsatisfiable range")
+    return lo, hi
+
+###############################################################################
+# JSON ENCODING (fixed-width ASCII byte matrices, one row per sample)
+###############################################################################
+def put_digits(rows, col, values, width):
+    """
+    Writes values as zero-padded `width`-digit ASCII into rows[col:col + width]
+    (a transposed (width, n) byte matrix, so each write is contiguous).
+    """
+    values = values.astype(np.int32) if width <= 9 else values
+    for k in range(width - 1, -1, -1):
+        rows[col + k] = 48 + values % 10
+        values = values // 10
+
+def ascii_numbers(vals, decimals=0):
+    """
+    Numbers => (n, width) uint8 matrix of right-aligned ASCII literals with
+    `decimals` fraction digits, left-padded with spaces (JSON whitespace)
+    so that every row has the same width.
+    """
+    scale = 10 ** decimals
+    vals = np.asarray(vals)
+    scaled = np.rint(vals * scale).astype(np.int64) if decimals else vals.astype(np.int64)
+    n = len(scaled)
+    neg = scaled < 0
+    ip = np.abs(scaled)
+    if decimals:
+        ip, fp = np.divmod(ip, scale)
+    nd = np.ones(n, dtype=np.int64)
+    p = 10
+    while n and (ip >= p).any():
+        nd += ip >= p
+        p *= 10
+    max_nd = int(nd.max()) if n else 1
+    frac_w = decimals + 1 if decimals else 0
+    width = 1 + max_nd + frac_w
+    rows = np.empty((width, n), dtype=np.uint8)
+    if decimals:
+        put_digits(rows, width - decimals, fp, decimals)
+        rows[width - frac_w] = ord(".")
+    uniform = n and int(nd.min()) == max_nd
+    for k in range(max_nd):
+        col = width - frac_w - 1 - k
+        digit = (48 + ip % 10).astype(np.uint8)
+        rows[col] = digit if uniform else np.where(k < nd, digit, np.uint8(32))
+        ip = ip // 10
+    rows[0] = 32
+    if neg.any():
+        idx = np.flatnonzero(neg)
+        rows[width - frac_w - 1 - nd[idx], idx] = ord("-")
+    return rows.T
+
+def civil_from_days(days):
+    """
+    Days since 1970-01-01 => proleptic Gregorian (year, month, day) arrays.
+    """
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    d = doy - (153 * mp + 2) // 5 + 1
+    m = np.where(mp < 10, mp + 3, mp - 9)
+    return yoe + era * 400 + (m <= 2), m, d
+
+# quoted date layouts: template and (column, field, width) of each number
+DATE_TEMPLATES = {
+    "iso": (b'"0000-00-00T00:00:00.000+00:00"',
+            (("y", 1, 4), ("m", 6, 2), ("d", 9, 2), ("H", 12, 2), ("M", 15, 2), ("S", 18, 2), ("ms", 21, 3))),
+    "unix": (b'"00:00:0000:00:00:00"',
+             (("d", 1, 2), ("m", 4, 2), ("y", 7, 4), ("H", 12, 2), ("M", 15, 2), ("S", 18, 2))),
+}
+
+def ascii_dates(ts_ms, date_format_param):
+    """
+    Epoch ms => (n, width) uint8 matrix of JSON date literals for the
+    requested dateFormat: integers for "epoch_ms", quoted
+    "dd:mm:yyyy:hh:mm:ss" for "unix", quoted ISO 8601 otherwise.
+    """
+    if date_format_param == "epoch_ms":
+        return ascii_numbers(ts_ms)
+    template, fields = DATE_TEMPLATES["unix" if date_format_param == "unix" else "iso"]
+    days, ms_of_day = np.divmod(ts_ms, 86400000)
+    y, m, d = civil_from_days(days)
+    secs = ms_of_day // 1000
+    parts = {"y": y, "m": m, "d": d, "H": secs // 3600, "M": secs // 60 % 60, "S": secs % 60, "ms": ms_of_day % 1000}
+    rows = np.repeat(np.frombuffer(template, dtype=np.uint8)[:, None], len(ts_ms), axis=1)
+    for name, col, width in fields:
+        put_digits(rows, col, parts[name], width)
+    return rows.T
+
+def json_rows(n, *parts):
+    """
+    Concatenates per-row byte matrices and literal bytes, one JSON value per
+    row, and joins the rows with commas.
+    """
+    cols = [np.broadcast_to(np.frombuffer(p, dtype=np.uint8), (n, len(p))) if isinstance(p, bytes) else p
+            for p in parts + (b",",)]
+    return np.concatenate(cols, axis=1).tobytes()[:-1]
+
+def stream_series(tag, ts_ms, vals, date_format_param, columnar, keys=("t", "v"), extra=b""):
+    """
+    Yields the JSON body for one tag's samples in STREAM_CHUNK pieces:
+    [{"Date": ..., "Value": ...}, ...] or, columnar, {"t": [...], "v": [...]}
+    (with `keys` as the two column names and `extra` members appended).
+    """
+    profile = tag_profile(tag)
+    decimals = profile.get("decimals", 2) if profile["kind"] == "float" else 0
+    chunks = range(0, len(ts_ms), STREAM_CHUNK)
+    if columnar:
+        yield f'{{"{keys[0]}":['.encode()
+        for i in chunks:
+            t = ts_ms[i:i + STREAM_CHUNK]
+            yield (b"," if i else b"") + json_rows(len(t), ascii_dates(t, date_format_param))
+        yield f'],"{keys[1]}":['.encode()
+        for i in chunks:
+            v = vals[i:i + STREAM_CHUNK]
+            yield (b"," if i else b"") + json_rows(len(v), ascii_numbers(v, decimals))
+        yield b']' + extra + b'}'
+        return
+    yield b'['
+    for i in chunks:
+        t, v = ts_ms[i:i + STREAM_CHUNK], vals[i:i + STREAM_CHUNK]
+        yield (b"," if i else b"") + json_rows(
+            len(t), b'{"Date":', ascii_dates(t, date_format_param), b',"Value":', ascii_numbers(v, decimals), b'}'
+        )
+    yield b']'
+
+def series_params(params):
+    """
+    (start_ts, end_ts, step_ms, seed) from request parameters, step_ms None
+    when ?step=<seconds> is absent (per-tag load profile rate); raises ValueError.
+    """
+    start_ts = int(params.get("startDateUnixSeconds", DEFAULT_START))
+    end_ts = int(params.get("endDateUnixSeconds", DEFAULT_END))
+    step = params.get("step")
+    step_ms = None if step is None else int(round(float(step) * 1000))
+    if step_ms is not None and not MIN_STEP_MS <= step_ms <= MAX_STEP_MS:
+        raise ValueError("step out of range")
+    seed = params.get("seed")
+    return start_ts, end_ts, step_ms, DEFAULT_SEED if seed is None else int(seed)
+
+def selected_samples(first, n, step_ms):
+    """
+    Applies the request's Range header to the n grid points from grid ms
+    `first`. Returns (first, count, content_range) for the selection, with
+    content_range None when the whole series was asked for; raises
+    ValueError when the range is unsatisfiable.
+    """
+    rng = sample_range(request.headers.get("Range"), n)
+    if rng is None:
+        return first, n, None
+    lo, hi = rng
+    return first + lo * step_ms, hi - lo + 1, f"samples {lo}-{hi}/{n}"
+
+def series_response(body, etag, content_range):
+    resp = Response(body, status=206 if content_range else 200, mimetype='application/json')
+    resp.set_etag(etag, weak=True)
+    resp.headers["Accept-Ranges"] = "samples"
+    resp.headers["Cache-Control"] = "no-cache"
+    if content_range:
+        resp.headers["Content-Range"] = content_range
+    return resp
+
+def not_modified(etag):
+    resp = Response(status=304)
+    resp.set_etag(etag, weak=True)
+    return resp
+
+def range_not_satisfiable(n):
+    resp = jsonify({"error": "Requested range not satisfiable."})
+    resp.status_code = 416
+    resp.headers["Content-Range"] = f"samples */{n}"
+    return resp
+
 @app.route('/values', methods=['GET'])
 def values():
     """
-    Returns random test data for the requested tag.
+    Returns test data for the requested tag: [{"Date", "Value"}, ...],
+    or {"t": [...], "v": [...]} with ?layout=columnar. Optional ?step=<seconds>
+    (default: the tag's load profile rate) and ?seed=<int>. Samples are
+    deterministic, so responses carry a weak ETag (304 on a matching
+    If-None-Match) and `Range: samples=lo-hi` selects grid points by index
+    (206 + Content-Range).
     """
     tag = request.args.get("tag")
-    
-    # Default timestamps (UTC)
-    default_start = int(datetime(2025, 2, 19, 0, 0, 0, tzinfo=timezone.utc).timestamp())
-    default_end = int(datetime(2025, 2, 25, 0, 0, 0, tzinfo=timezone.utc).timestamp())
-    
+
     try:
-        start_ts = int(request.args.get("startDateUnixSeconds", default_start))
-        end_ts = int(request.args.get("endDateUnixSeconds", default_end))
-    except ValueError:
+        start_ts, end_ts, step_ms, seed = series_params(request.args)
+    except (TypeError, ValueError):
         return jsonify({"error": "Invalid timestamp parameters."}), 400
 
     # Check for a query parameter to decide the date format.
-    # If dateFormat=unix then return "dd:mm:yyyy:hh:mm:ss"; otherwise use ISO format.
     date_format_param = request.args.get("dateFormat", "iso").lower()
-    
-    data = []
-    step = 45  # one-minute step
-    current_ts = start_ts
-
-    while current_ts <= end_ts:
-        dt = datetime.fromtimestamp(current_ts, tz=timezone.utc)
-        dt = dt.replace(microsecond=random.randint(0, 999) * 1000)
-        
-        if date_format_param == "unix":
-            dt_str = dt.strftime("%d:%m:%Y:%H:%M:%S")
-        else:
-            dt_str = dt.isoformat(timespec='milliseconds')
-        
-        # Generate a dummy value based on the tag requested.
-        if tag == "Hybrid.ESS.MaxCellVoltage":
-            value = random.randint(3330, 3340)
-        elif tag == "Hybrid.ESS.MinCellVoltage":
-            value = random.randint(3300, 3320)
-        elif tag == "Hybrid.ESS.AverageCellVoltage":
-            value = random.randint(3320, 3330)
-        elif tag == "Sensor.Temperature":
-            value = round(20 + random.uniform(-5, 5), 2)
-        elif tag == "Sensor.Pressure":
-            value = round(1000 + random.uniform(-20, 20), 2)
-        elif tag == "Sensor.Humidity":
-            value = round(50 + random.uniform(-10, 10), 2)
-        elif tag == "Machine.Speed":
-            value = round(1500 + random.uniform(-100, 100), 2)
-        elif tag == "Machine.Temperature":
-            value = round(80 + random.uniform(-10, 10), 2)
-        elif tag == "Generator.PowerOutput":
-            value = round(random.uniform(50, 150), 2)
-        elif tag == "Generator.FuelConsumption":
-            value = round(random.uniform(0.5, 5.0), 2)
-        elif tag == "EXT.SignalStrength":
-            value = random.randint(1, 100)
-        elif tag == "EXT.SystemVoltage":
-            value = random.randint(210, 240)
+    columnar = request.args.get("layout", "records").lower() == "columnar"
+
+    step_ms = step_ms or tag_step_ms(tag)
+    first, n = sample_grid(start_ts, end_ts, step_ms)
+    etag = series_etag(tag, first, n, step_ms, seed)
+    if request.if_none_match.contains_weak(etag):
+        return not_modified(etag)
+    try:
+        first, count, content_range = selected_samples(first, n, step_ms)
+    except ValueError:
+        return range_not_satisfiable(n)
+
+    ts_ms, vals = generate_series(tag, first, count, step_ms, seed)
+    body = stream_series(tag, ts_ms, vals, date_format_param, columnar)
+    return series_response(body, etag, content_range)
+
+@app.route('/values_batch', methods=['GET', 'POST'])
+def values_batch():
+    """
+    Returns test data for many tags over one time range, columnar per tag:
+    {"start": ..., "end": ..., "tags": {tag: {"Date": [...], "Value": [...], "etag": ...}}}
+    ({tag: {"t": [...], "v": [...], "etag": ...}} with layout "columnar").
+    POST a JSON body {"tags", "startDateUnixSeconds", "endDateUnixSeconds", "dateFormat",
+    "layout", "step", "seed", "ifNoneMatch"} or GET with repeated ?tag= parameters.
+    Tags whose etag is in ifNoneMatch {tag: etag} come back as
+    {"etag": ..., "notModified": true}. If-None-Match works as for /values
+    over all tags, and so does Range while all tags share one sample grid
+    (it is ignored when their load profile rates differ).
+    """
+    if request.method == 'POST':
+        params = request.get_json(silent=True) or {}
+        tags = params.get("tags", [])
+    else:
+        params = request.args
+        tags = request.args.getlist("tag")
+
+    if not tags:
+        return jsonify({"error": "No tags requested."}), 400
+    try:
+        start_ts, end_ts, step_ms, seed = series_params(params)
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid timestamp parameters."}), 400
+    date_format_param = str(params.get("dateFormat", "iso")).lower()
+    columnar = str(params.get("layout", "records")).lower() == "columnar"
+    known = params.get("ifNoneMatch") if request.method == 'POST' else None
+    known = known if isinstance(known, dict) else {}
+
+    steps = {tag: step_ms or tag_step_ms(tag) for tag in tags}
+    grids = {tag: sample_grid(start_ts, end_ts, steps[tag]) for tag in tags}
+    etags = {tag: series_etag(tag, *grids[tag], steps[tag], seed) for tag in tags}
+    etag = hashlib.sha1(json.dumps(etags, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+    if request.if_none_match.contains_weak(etag):
+        return not_modified(etag)
+    selection = {tag: grids[tag] for tag in tags}
+    content_range = None
+    if len(set(steps.values())) == 1:
+        step = steps[tags[0]]
+        try:
+            sel_first, count, content_range = selected_samples(*grids[tags[0]], step)
+        except ValueError:
+            return range_not_satisfiable(grids[tags[0]][1])
+        selection = {tag: (sel_first, count) for tag in tags}
+
+    def body():
+        yield f'{{"start":{start_ts},"end":{end_ts},"tags":{{'.encode()
+        for k, tag in enumerate(tags):
+            yield (("," if k else "") + json.dumps(tag) + ":").encode()
+            tag_etag = json.dumps(f'W/"{etags[tag]}"')
+            if str(known.get(tag, "")).removeprefix("W/") == f'"{etags[tag]}"':
+                yield f'{{"etag":{tag_etag},"notModified":true}}'.encode()
+                continue
+            keys = ("t", "v") if columnar else ("Date", "Value")
+            ts_ms, vals = generate_series(tag, *selection[tag], steps[tag], seed)
+            yield from stream_series(tag, ts_ms, vals, date_format_param, True, keys, f',"etag":{tag_etag}'.encode())
+        yield b'}}'
+
+    return series_response(body(), etag, content_range)
+
+###############################################################################
+# LOAD INJECTION (latency, errors, stalls, bandwidth on the profiled endpoints)
+###############################################################################
+THROTTLE_PIECE = 16384  # bytes sent per throttled write
+
+@app.before_request
+def inject_load():
+    """
+    Waits one latency draw, then fails the request (errors.rate), stalls
+    it (timeouts.rate) or lets it through.
+    """
+    if request.endpoint not in LOAD_PROFILE["endpoints"]:
+        return None
+    delay = draw_latency()
+    if delay:
+        time.sleep(delay)
+    errors, timeouts = LOAD_PROFILE["errors"], LOAD_PROFILE["timeouts"]
+    u = draw_uniform()
+    if u < float(errors["rate"]):
+        statuses = errors["statuses"]
+        status = int(statuses[min(int(u / float(errors["rate"]) * len(statuses)), len(statuses) - 1)])
+        resp = jsonify({"error": f"Injected failure ({status})."})
+        resp.status_code = status
+        if status in (429, 503) and errors.get("retry_after_s"):
+            resp.headers["Retry-After"] = str(int(errors["retry_after_s"]))
+        return resp
+    if u < float(errors["rate"]) + float(timeouts["rate"]):
+        if timeouts["where"] == "headers":
+            time.sleep(float(timeouts["stall_s"]))
         else:
-            value = random.randint(0, 100)
-        
-        record = {
-            "Date": dt_str,
-            "Value": value
-        }
-        data.append(record)
-        current_ts += step
+            g.stall_body = True
+    return None
+
+def throttled(body, request_throttle, stall_s):
+    """
+    Re-yields body in THROTTLE_PIECE writes paced by the per-request and
+    shared throttles, stalling stall_s after the first piece if set.
+    """
+    for chunk in body:
+        for i in range(0, len(chunk), THROTTLE_PIECE):
+            piece = chunk[i:i + THROTTLE_PIECE]
+            waits = [t.reserve(len(piece)) for t in (request_throttle, TOTAL_THROTTLE) if t is not None]
+            if waits and max(waits) > 0:
+                time.sleep(max(waits))
+            yield piece
+            if stall_s:
+                time.sleep(stall_s)
+                stall_s = 0
 
-    return jsonify(data)
+@app.after_request
+def shape_response(resp):
+    if request.endpoint not in LOAD_PROFILE["endpoints"] or resp.status_code not in (200, 206):
+        return resp
+    per_request = float(LOAD_PROFILE["bandwidth"]["request_kBps"])
+    stall_s = float(LOAD_PROFILE["timeouts"]["stall_s"]) if g.get("stall_body") else 0
+    if per_request > 0 or TOTAL_THROTTLE is not None or stall_s:
+        body = resp.response if resp.is_streamed else [resp.get_data()]
+        resp.response = throttled(body, Throttle(per_request * 1000) if per_request > 0 else None, stall_s)
+    return resp
+
+@app.route('/load_profile', methods=['GET'])
+def load_profile():
+    """
+    The active load profile, to record alongside benchmark results.
+    """
+    return jsonify(LOAD_PROFILE)
+
+###############################################################################
+# MAIN
+###############################################################################
+def latency_arg(text):
+    """
+    "DIST:MS[:SPREAD]" => latency section, e.g. lognormal:80:0.5.
+    """
+    parts = text.split(":")
+    if parts[0] not in LATENCY_DISTS or len(parts) > 3:
+        raise argparse.ArgumentTypeError(f"expected DIST:MS[:SPREAD] with DIST in {', '.join(LATENCY_DISTS)}")
+    try:
+        return {"dist": parts[0], "ms": float(parts[1]) if len(parts) > 1 else 0.0,
+                "spread": float(parts[2]) if len(parts) > 2 else 0.0}
+    except ValueError:
+        raise argparse.ArgumentTypeError("MS and SPREAD must be numbers")
+
+def statuses_arg(text):
+    try:
+        return [int(x) for x in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected comma-separated HTTP statuses")
+
+def tag_step_arg(text):
+    pattern, sep, ms = text.rpartition("=")
+    if not sep or not pattern or not ms.isdigit():
+        raise argparse.ArgumentTypeError("expected PATTERN=MS")
+    return pattern, int(ms)
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Historian mock for DETool. Without options it answers instantly; "
+                    "a load profile (--profile FILE and/or the flags below, which override the file) "
+                    "emulates a production historian.")
+    ap.add_argument("--port", type=int, default=61185)
+    ap.add_argument("--profile", metavar="FILE", help="JSON load profile (print the format with --dump-profile)")
+    ap.add_argument("--dump-profile", action="store_true", help="print the effective load profile and exit")
+    ap.add_argument("--seed", type=int, help="seed of the latency/error/stall draws")
+    ap.add_argument("--endpoints", help="comma-separated endpoints the profile applies to")
+    ap.add_argument("--latency", type=latency_arg, metavar="DIST:MS[:SPREAD]",
+                    help="per-request latency: fixed:30, uniform:50:20, normal:80:15, lognormal:80:0.5")
+    ap.add_argument("--latency-max-ms", type=float, help="latency draws are clipped to this")
+    ap.add_argument("--bandwidth-kBps", type=float, help="per-response bandwidth limit")
+    ap.add_argument("--total-bandwidth-kBps", type=float, help="bandwidth limit shared by all responses")
+    ap.add_argument("--error-rate", type=float, help="fraction of requests failing with --error-statuses")
+    ap.add_argument("--error-statuses", type=statuses_arg, help="comma-separated HTTP statuses, e.g. 500,503,429")
+    ap.add_argument("--timeout-rate", type=float, help="fraction of requests stalling for --stall-s")
+    ap.add_argument("--stall-s", type=float, help="stall length (longer than the client read timeout)")
+    ap.add_argument("--stall-where", choices=("headers", "body"))
+    ap.add_argument("--step-ms", type=int, help="default sample period")
+    ap.add_argument("--tag-step", type=tag_step_arg, action="append", metavar="PATTERN=MS",
+                    help="sample period for tags matching an fnmatch pattern (repeatable, first match wins)")
+    ap.add_argument("--gap-rate", type=float, help="fraction of --gap-max-s slots with a gap")
+    ap.add_argument("--gap-min-s", type=int)
+    ap.add_argument("--gap-max-s", type=int)
+    ap.add_argument("--ooo-rate", type=float, help="fraction of samples sent out of order")
+    ap.add_argument("--ooo-max-shift", type=int, help="how many positions late they arrive at most")
+    args = ap.parse_args(argv)
+
+    profile = {}
+    if args.profile:
+        try:
+            with open(args.profile, "r", encoding="utf-8") as f:
+                profile = json.load(f)
+        except (OSError, ValueError) as e:
+            ap.error(f"cannot read load profile {args.profile}: {e}")
+    flags = {
+        ("seed", None): args.seed,
+        ("endpoints", None): args.endpoints and [e.strip() for e in args.endpoints.split(",") if e.strip()],
+        ("latency", "max_ms"): args.latency_max_ms,
+        ("bandwidth", "request_kBps"): args.bandwidth_kBps,
+        ("bandwidth", "total_kBps"): args.total_bandwidth_kBps,
+        ("errors", "rate"): args.error_rate,
+        ("errors", "statuses"): args.error_statuses,
+        ("timeouts", "rate"): args.timeout_rate,
+        ("timeouts", "stall_s"): args.stall_s,
+        ("timeouts", "where"): args.stall_where,
+        ("sample_rates", "default_ms"): args.step_ms,
+        ("sample_rates", "tags"): args.tag_step and dict(args.tag_step),
+        ("gaps", "rate"): args.gap_rate,
+        ("gaps", "min_s"): args.gap_min_s,
+        ("gaps", "max_s"): args.gap_max_s,
+        ("out_of_order", "rate"): args.ooo_rate,
+        ("out_of_order", "max_shift"): args.ooo_max_shift,
+    }
+    if args.latency:
+        profile.setdefault("latency", {}).update(args.latency)
+    for (section, key), value in flags.items():
+        if value is None:
+            continue
+        if key is None:
+            profile[section] = value
+        else:
+            profile.setdefault(section, {})[key] = value
+    try:
+        set_load_profile(profile)
+    except (TypeError, ValueError) as e:
+        ap.error(f"invalid load profile: {e}")
+    return args
 
 if __name__ == '__main__':
-    app.run(port=61185)
\ No newline at end of file
+    args = parse_args()
+    if args.dump_profile:
+        print(json.dumps(LOAD_PROFILE, indent=2))
+    else:
+        app.run(port=args.port, threaded=True)
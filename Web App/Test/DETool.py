@@ -6,6 +6,8 @@ import json
 import io
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
 from flask import Flask, send_from_directory, request, jsonify, make_response, Response
@@ -21,7 +23,13 @@ import datetime
 import logging
 from logging.handlers import RotatingFileHandler
 import csv
+import struct
+import hashlib
+from collections import deque
+import shutil
+import queue
 from threading import Lock
+from abc import ABC, abstractmethod
 
 ###############################################################################
 # GLOBAL CONCURRENCY LOCK
@@ -77,6 +85,30 @@ DATA_DIR = "data"
 
 EXTERNAL_TAGLIST_URL = "http://localhost:61185/taglist"
 EXTERNAL_VALUES_URL = "http://localhost:61185/values"
+EXTERNAL_VALUES_BATCH_URL = "http://localhost:61185/values_batch"
+EXTERNAL_CAPABILITIES_URL = "http://localhost:61185/capabilities"
+
+# Historian HTTP client
+HISTORIAN_POOL_SIZE = 16          # keep-alive connections kept per host
+HISTORIAN_MAX_HOSTS = 4           # hosts with their own connection pool
+HISTORIAN_CONNECT_TIMEOUT = 3.05
+HISTORIAN_READ_TIMEOUT = 15
+HISTORIAN_RETRIES = 3
+HISTORIAN_BACKOFF = 0.5           # seconds, doubled per retry
+HISTORIAN_STATS_EVERY = 200       # log client stats every N requests
+HISTORIAN_BATCH_MAX_TAGS = 50     # tags per /values_batch call
+HISTORIAN_CAPS_RETRY_SECONDS = 60 # a failed /capabilities probe is not repeated sooner
+HISTORIAN_LAG_SECONDS = 60        # samples can reach the historian this late: newer ranges stay uncovered
+
+# Large fetches are split on a fixed grid of FETCH_CHUNK_SECONDS and merged
+# whenever FETCH_COMMIT_ROWS parsed rows are waiting
+FETCH_CHUNK_SECONDS = 86400
+FETCH_COMMIT_ROWS = 250_000
+
+# RegisterDataType => RAW_TABLE dtype. The nullable integer/boolean dtypes
+# keep a validity mask instead of widening to float64 for missing samples.
+RAW_DTYPES = {"Single": "float32", "UInt16": "UInt16", "UInt32": "UInt32", "Boolean": "boolean"}
+RAW_DEFAULT_DTYPE = "float64"
 
 app = Flask(__name__, static_folder=DATA_DIR)
 
@@ -86,12 +118,32 @@ app = Flask(__name__, static_folder=DATA_DIR)
 RAW_TABLE = None
 WORKING_TABLE = None
 TAGLIST_CACHE = None
-LAST_SETTINGS = None
 TAG_COVERAGE = {}
+TAG_SETTINGS = None
+
+# Historian ETag per fetched chunk: tag => {(st, en): etag}, for conditional re-fetches
+TAG_ETAGS = {}
 
 # CHANGED: Add a global signature to track changes to RAW_TABLE
 RAW_TABLE_SIGNATURE = None
 
+# Tags whose RAW_TABLE column changed (or was dropped) since the last cache save
+RAW_DIRTY_TAGS = set()
+
+# Smallest NumericTimestamp merged into RAW_TABLE since WORKING_TABLE was last updated
+RAW_DIRTY_FROM = None
+
+# Settings WORKING_TABLE was built with: offset_ms, forward_fill, per-column tag settings
+WT_STATE = None
+
+# WORKING_TABLE was fully rebuilt since WorkingTable.json was last written
+WT_CACHE_DIRTY = False
+
+# WORKING_TABLE version token "<epoch>:<n>" and recent changes for delta responses
+WT_EPOCH = os.urandom(4).hex()
+WT_VERSION = 0
+WT_HISTORY = deque(maxlen=256)  # (version, first changed NumericTimestamp or None => everything)
+
 ###############################################################################
 # PATH HELPERS
 ###############################################################################
@@ -123,12 +175,55 @@ def get_working_table_cache_path():
 def get_raw_table_cache_path():
     return os.path.join(get_cache_folder(), "RawTable.json")
 
+def get_raw_table_store_path():
+    p = os.path.join(get_cache_folder(), "RawTable")
+    os.makedirs(p, exist_ok=True)
+    return p
+
 def get_tag_coverage_cache_path():
     return os.path.join(get_cache_folder(), "TagCoverage.json")
 
+def get_tag_coverage_log_path():
+    return os.path.join(get_cache_folder(), "TagCoverage.log")
+
+def get_tag_etags_path():
+    return os.path.join(get_cache_folder(), "TagETags.json")
+
 def fmt_timestamp(dt):
     return dt.strftime("%d/%m/%Y %H:%M:%S")
 
+def fmt_timestamps_ms(ms):
+    """
+    Vectorized fmt_timestamp over an array of epoch milliseconds. The date
+    part is formatted once per distinct day (format cache), the time part is
+    composed arithmetically as fixed-width ASCII.
+    """
+    ms = np.asarray(ms, dtype=np.int64)
+    if not len(ms):
+        return np.array([], dtype=object)
+    days, sod = np.divmod(ms // 1000, 86400)
+    udays, inverse = np.unique(days, return_inverse=True)
+    day_strs = pd.to_datetime(udays, unit="D").strftime("%d/%m/%Y ")
+    day_bytes = np.frombuffer("".join(day_strs).encode("ascii"), dtype=np.uint8).reshape(-1, 11)
+    out = np.empty((len(ms), 19), dtype=np.uint8)
+    out[:, :11] = day_bytes[inverse]
+    hh, rem = np.divmod(sod, 3600)
+    mm, ss = np.divmod(rem, 60)
+    for pos, part in ((11, hh), (14, mm), (17, ss)):
+        out[:, pos] = 48 + part // 10
+        out[:, pos + 1] = 48 + part % 10
+    out[:, [13, 16]] = ord(":")
+    return out.view("S19").ravel().astype("U19").astype(object)
+
+def with_timestamp_column(df):
+    """
+    Returns a copy of df with the display "Timestamp" column (formatted from
+    NumericTimestamp) inserted first. Tables only ever store NumericTimestamp.
+    """
+    out = df.copy()
+    out.insert(0, "Timestamp", fmt_timestamps_ms(out["NumericTimestamp"].to_numpy()))
+    return out
+
 ###############################################################################
 # ATOMIC JSON & DATAFRAME SAVE/LOAD
 ###############################################################################
@@ -154,6 +249,9 @@ def save_df_to_json(df, path):
     if df is None or df.empty:
         payload = {"columns": [], "data": []}
     else:
+        if not all(isinstance(dt, np.dtype) for dt in df.dtypes):
+            # nullable UInt16/UInt32/boolean columns: pd.NA => null
+            df = df.astype(object).where(df.notna(), None)
         payload = {
             "columns": df.columns.tolist(),
             "data": df.values.tolist()
@@ -178,39 +276,389 @@ def load_df_from_json(path):
         python_logger.error(f"Error loading DF from JSON {path}: {e}")
         return pd.DataFrame()
 
+###############################################################################
+# RAW_TABLE CACHE BACKENDS
+###############################################################################
+class RawTableCache(ABC):
+    """
+    Base class of the RAW_TABLE persistence backends. `save` receives the
+    set of tags whose column changed since the last save (None =>
+    everything), `load` may be limited to a subset of tags. Backends with
+    `supports_append` also persist newly merged rows without touching the
+    rest of the table (`append`, folded back by `compact`) and can give
+    single tags back with `read_tag`.
+    """
+    supports_append = False
+
+    @abstractmethod
+    def save(self, df, dirty_tags=None):
+        """
+        Writes the dirty tags of df (RAW_TABLE).
+        """
+
+    @abstractmethod
+    def load(self, tags=None):
+        """
+        RAW_TABLE (or just `tags`) as stored; empty frame when nothing is.
+        """
+
+    @abstractmethod
+    def stored_tags(self):
+        """
+        Tags with a stored column.
+        """
+
+    @abstractmethod
+    def clear(self):
+        """
+        Deletes everything stored.
+        """
+
+    def append(self, tag, ts, vals, dtype=RAW_DEFAULT_DTYPE):
+        """
+        Logs merged rows of one tag. Returns False when nothing was written
+        and the tag needs a full save, as here without append support.
+        """
+        return False
+
+    def compact(self):
+        """
+        Folds pending append logs into the stored columns; returns how many.
+        """
+        return 0
+
+class JsonRawTableCache(RawTableCache):
+    """
+    Legacy single-file RawTable.json format (whole table on every save).
+    """
+    def save(self, df, dirty_tags=None):
+        save_df_to_json(df, get_raw_table_cache_path())
+
+    def load(self, tags=None):
+        df = load_df_from_json(get_raw_table_cache_path())
+        if tags is not None and not df.empty:
+            keep = [c for c in df.columns if c == "NumericTimestamp" or c in tags]
+            df = df[keep]
+        # display strings are no longer stored in RAW_TABLE
+        df = df.drop(columns=["Timestamp"], errors="ignore")
+        if not df.empty:
+            # JSON rows come back as floats/None: restore the RAW_TABLE types
+            df["NumericTimestamp"] = df["NumericTimestamp"].astype(np.int64)
+            df = conform_raw_dtypes(df, [c for c in df.columns if c != "NumericTimestamp"])
+        return df
+
+    def stored_tags(self):
+        df = load_df_from_json(get_raw_table_cache_path())
+        return [c for c in df.columns if c not in ("NumericTimestamp", "Timestamp")]
+
+    def clear(self):
+        p = get_raw_table_cache_path()
+        if os.path.exists(p):
+            os.remove(p)
+
+class ColumnarRawTableCache(RawTableCache):
+    """
+    One typed binary chunk per tag: <key>.ts.npy (int64 ms) + <key>.val.npy,
+    described by manifest.json. Only dirty tags are rewritten on save and
+    only the requested tags are memory-mapped on load. Values keep the
+    RAW_TABLE dtype recorded in the manifest (float32, uint16/uint32 for
+    the nullable integer dtypes, booleans bit-packed with np.packbits).
+
+    Newly merged rows go to an append-only <key>.wal log of (ts, value)
+    records; reads replay the log over the base chunk (last write wins) and
+    `compact` folds logs back into the base chunks.
+    """
+    MANIFEST = "manifest.json"
+    FORMAT_VERSION = 1
+    WAL_DTYPE = np.dtype([("t", "<i8"), ("v", "<f8")])
+    supports_append = True
+
+    def __init__(self):
+        self.root = get_raw_table_store_path()
+        self.manifest = self._read_manifest()
+        self.lock = threading.RLock()
+
+    def _read_manifest(self):
+        m = safe_load_json(os.path.join(self.root, self.MANIFEST), {})
+        if m.get("format") != self.FORMAT_VERSION:
+            return {"format": self.FORMAT_VERSION, "tags": {}}
+        return m
+
+    def _write_manifest(self):
+        atomic_write_json(os.path.join(self.root, self.MANIFEST), self.manifest)
+
+    @staticmethod
+    def tag_key(tag):
+        return hashlib.sha1(tag.encode("utf-8")).hexdigest()[:16]
+
+    def _paths(self, key):
+        return (os.path.join(self.root, key + ".ts.npy"),
+                os.path.join(self.root, key + ".val.npy"))
+
+    def _wal_path(self, key):
+        return os.path.join(self.root, key + ".wal")
+
+    def _read_wal(self, key):
+        path = self._wal_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            buf = f.read()
+        # ignore a torn trailing record from an interrupted append
+        usable = len(buf) - (len(buf) % self.WAL_DTYPE.itemsize)
+        if usable <= 0:
+            return None
+        return np.frombuffer(buf[:usable], dtype=self.WAL_DTYPE)
+
+    def wal_bytes(self):
+        total = 0
+        for meta in self.manifest["tags"].values():
+            path = self._wal_path(meta["key"])
+            if os.path.exists(path):
+                total += os.path.getsize(path)
+        return total
+
+    @staticmethod
+    def _atomic_save_npy(path, arr):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def storage_dtype(dtype):
+        """
+        RAW_TABLE dtype name => numpy dtype of the stored (valid) values.
+        """
+        dt = pd.api.types.pandas_dtype(dtype)
+        return getattr(dt, "numpy_dtype", dt)
+
+    def write_tag(self, tag, ts, vals, dtype=RAW_DEFAULT_DTYPE):
+        key = self.tag_key(tag)
+        ts_path, val_path = self._paths(key)
+        ts = np.ascontiguousarray(ts, dtype=np.int64)
+        vals = np.ascontiguousarray(vals, dtype=self.storage_dtype(dtype))
+        self._atomic_save_npy(ts_path, ts)
+        self._atomic_save_npy(val_path, np.packbits(vals) if vals.dtype == np.bool_ else vals)
+        # the base chunk now holds everything, so any pending log is obsolete
+        wal = self._wal_path(key)
+        if os.path.exists(wal):
+            os.remove(wal)
+        self.manifest["tags"][tag] = {
+            "key": key,
+            "rows": int(len(ts)),
+            "dtype": str(dtype),
+            "first": int(ts[0]) if len(ts) else None,
+            "last": int(ts[-1]) if len(ts) else None
+        }
+
+    def delete_tag(self, tag):
+        meta = self.manifest["tags"].pop(tag, None)
+        if not meta:
+            return
+        for path in self._paths(meta["key"]) + (self._wal_path(meta["key"]),):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def tag_dtype(self, tag):
+        meta = self.manifest["tags"].get(tag)
+        return meta.get("dtype", RAW_DEFAULT_DTYPE) if meta else None
+
+    def read_tag(self, tag):
+        """
+        Returns (ts, vals) numpy copies for one tag, or None if not stored;
+        vals are in storage_dtype(tag_dtype(tag)). The files are
+        memory-mapped so nothing else is read from disk.
+        """
+        with self.lock:
+            meta = self.manifest["tags"].get(tag)
+            if not meta:
+                return None
+            storage = self.storage_dtype(meta.get("dtype", RAW_DEFAULT_DTYPE))
+            ts_path, val_path = self._paths(meta["key"])
+            if os.path.exists(ts_path):
+                ts_mm = np.load(ts_path, mmap_mode="r")
+                val_mm = np.load(val_path, mmap_mode="r")
+                # copy out so the mapping is released (Windows keeps mapped files locked)
+                ts, vals = np.array(ts_mm), np.array(val_mm)
+                del ts_mm, val_mm
+                if storage == np.bool_:
+                    vals = np.unpackbits(vals, count=len(ts)).astype(np.bool_)
+            else:
+                ts, vals = np.empty(0, dtype=np.int64), np.empty(0, dtype=storage)
+            wal = self._read_wal(meta["key"])
+        if wal is None:
+            return ts, vals
+        all_ts = np.concatenate([ts, wal["t"]])
+        all_v = np.concatenate([vals, wal["v"].astype(vals.dtype, copy=False)])
+        order = np.argsort(all_ts, kind="stable")
+        all_ts, all_v = all_ts[order], all_v[order]
+        # later records win on duplicate timestamps
+        keep = np.ones(len(all_ts), dtype=bool)
+        keep[:-1] = all_ts[1:] != all_ts[:-1]
+        return all_ts[keep], all_v[keep]
+
+    def append(self, tag, ts, vals, dtype=RAW_DEFAULT_DTYPE):
+        """
+        Appends merged rows for one tag to its log: O(new rows) of disk I/O.
+        Returns False (nothing written) when the stored chunk has another
+        dtype; the tag then needs a full save.
+        """
+        with self.lock:
+            if tag not in self.manifest["tags"]:
+                self.manifest["tags"][tag] = {
+                    "key": self.tag_key(tag), "rows": 0, "dtype": str(dtype), "first": None, "last": None
+                }
+                self._write_manifest()
+            elif self.tag_dtype(tag) != str(dtype):
+                return False
+            rec = np.empty(len(ts), dtype=self.WAL_DTYPE)
+            rec["t"] = ts
+            rec["v"] = vals
+            with open(self._wal_path(self.manifest["tags"][tag]["key"]), "ab") as f:
+                f.write(rec.tobytes())
+            return True
+
+    def compact(self):
+        """
+        Folds every pending log into its base chunk.
+        """
+        with self.lock:
+            pending = [t for t, m in self.manifest["tags"].items()
+                       if os.path.exists(self._wal_path(m["key"]))]
+            for tag in pending:
+                got = self.read_tag(tag)
+                if got is not None:
+                    self.write_tag(tag, got[0], got[1], self.tag_dtype(tag))
+            if pending:
+                self._write_manifest()
+            return len(pending)
+
+    def save(self, df, dirty_tags=None):
+        cols = set() if df is None or df.empty else set(df.columns) - {"NumericTimestamp", "Timestamp"}
+        with self.lock:
+            if dirty_tags is None:
+                dirty_tags = cols | set(self.manifest["tags"].keys())
+            for tag in dirty_tags:
+                if tag not in cols:
+                    self.delete_tag(tag)
+                    continue
+                col = df[tag]
+                mask = col.notna().to_numpy()
+                dtype = stored_dtype_name(col)
+                vals = col[mask].to_numpy(dtype=self.storage_dtype(dtype))
+                self.write_tag(tag, df["NumericTimestamp"].to_numpy()[mask], vals, dtype)
+            self._write_manifest()
+
+    def load(self, tags=None):
+        if tags is None:
+            tags = self.stored_tags()
+        series = []
+        for tag in tags:
+            try:
+                got = self.read_tag(tag)
+            except Exception as e:
+                python_logger.error(f"Error reading cached column {tag}: {e}")
+                continue
+            if got is None or not len(got[0]):
+                continue
+            ts, vals = got
+            series.append(pd.Series(vals, index=ts, name=tag).astype(self.tag_dtype(tag)))
+        if not series:
+            return pd.DataFrame(columns=["NumericTimestamp"])
+        wide = pd.concat(series, axis=1).sort_index()
+        wide.index.name = "NumericTimestamp"
+        return wide.reset_index()
+
+    def stored_tags(self):
+        return list(self.manifest["tags"].keys())
+
+    def clear(self):
+        with self.lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self.root = get_raw_table_store_path()
+            self.manifest = {"format": self.FORMAT_VERSION, "tags": {}}
+
+RAW_CACHE_BACKENDS = {
+    "json": JsonRawTableCache,
+    "columnar": ColumnarRawTableCache
+}
+RAW_CACHE_BACKEND = "columnar"
+_RAW_CACHE = None
+
+def get_raw_cache():
+    global _RAW_CACHE
+    if _RAW_CACHE is None:
+        _RAW_CACHE = RAW_CACHE_BACKENDS[RAW_CACHE_BACKEND]()
+    return _RAW_CACHE
+
 ###############################################################################
 # LOAD/SAVE RAW & WORKING, TAG_COVERAGE
 ###############################################################################
 def save_raw_table_cache():
-    global RAW_TABLE
+    global RAW_TABLE, RAW_DIRTY_TAGS
     if RAW_TABLE is not None:
-        p = get_raw_table_cache_path()
         try:
-            save_df_to_json(RAW_TABLE, p)
+            # a tag's file is rewritten whole: bring its evicted blocks back first
+            reload_evicted_blocks([k for k in EVICTED_BLOCKS if k[0] in RAW_DIRTY_TAGS])
+            get_raw_cache().save(RAW_TABLE, set(RAW_DIRTY_TAGS))
+            RAW_DIRTY_TAGS.clear()
             python_logger.info("RAW_TABLE cached successfully.")
         except Exception as e:
             python_logger.error(f"Error caching RAW_TABLE: {e}")
 
-def load_raw_table_cache():
-    global RAW_TABLE
-    p = get_raw_table_cache_path()
-    if os.path.exists(p):
-        try:
-            df = load_df_from_json(p)
+def load_raw_table_cache(tags=None):
+    """
+    Loads RAW_TABLE (or just `tags`) from the cache backend. A legacy
+    RawTable.json is migrated into the columnar store on first load.
+    """
+    cache = get_raw_cache()
+    try:
+        if isinstance(cache, ColumnarRawTableCache) and os.path.exists(get_raw_table_cache_path()):
+            legacy = JsonRawTableCache()
+            df = legacy.load()
             if not df.empty:
-                python_logger.info("Loaded RAW_TABLE from JSON cache.")
-                return df
-        except Exception as e:
-            python_logger.error(f"Error loading RAW_TABLE: {e}")
+                cache.save(df)
+                python_logger.info("Migrated RawTable.json into the columnar cache.")
+            legacy.clear()
+        df = cache.load(tags)
+        if not df.empty:
+            python_logger.info(f"Loaded RAW_TABLE from {RAW_CACHE_BACKEND} cache ({len(df.columns) - 1} tags).")
+            return df
+    except Exception as e:
+        python_logger.error(f"Error loading RAW_TABLE: {e}")
     # if missing or error, return empty
-    return pd.DataFrame(columns=["NumericTimestamp", "Timestamp"])
+    return pd.DataFrame(columns=["NumericTimestamp"])
 
-def save_working_table_cache():
-    global WORKING_TABLE
-    if WORKING_TABLE is not None:
+def ensure_tags_resident(tags, st=None, en=None):
+    """
+    Memory-maps cached columns for requested tags that are not yet in
+    RAW_TABLE (startup loads nothing up front). With (st, en) (unix
+    seconds), blocks of that range evicted by the memory budget are read
+    back from the cache as well. Returns whether RAW_TABLE changed.
+    """
+    global RAW_TABLE, RAW_DIRTY_TAGS
+    cache = get_raw_cache()
+    present = set(RAW_TABLE.columns) if RAW_TABLE is not None else set()
+    stored = set(cache.stored_tags())
+    want = [t for t in tags if t not in present and t in stored]
+    loaded = False
+    if want:
+        df = load_raw_table_cache(want)
+        if not df.empty:
+            merge_new_data_into_raw_table(df)
+            RAW_DIRTY_TAGS.difference_update(want)
+            loaded = True
+    if st is not None and EVICTED_BLOCKS:
+        blocks = range(int(st) // EVICT_BLOCK_SECONDS, int(en) // EVICT_BLOCK_SECONDS + 1)
+        loaded = reload_evicted_blocks([(t, b) for t in tags for b in blocks]) or loaded
+    return loaded
+
+def save_working_table_cache(wt):
+    if wt is not None:
         p = get_working_table_cache_path()
         try:
-            save_df_to_json(WORKING_TABLE, p)
+            save_df_to_json(wt, p)
             python_logger.info("WORKING_TABLE cached successfully.")
         except Exception as e:
             python_logger.error(f"Error caching WORKING_TABLE: {e}")
@@ -219,7 +667,7 @@ def load_working_table_cache():
     p = get_working_table_cache_path()
     if os.path.exists(p):
         try:
-            df = load_df_from_json(p)
+            df = load_df_from_json(p).drop(columns=["Timestamp"], errors="ignore")
             python_logger.info("Loaded WORKING_TABLE from JSON cache.")
             return df
         except Exception as e:
@@ -227,25 +675,152 @@ def load_working_table_cache():
     return None
 
 def save_tag_coverage():
+    """
+    Writes the full TAG_COVERAGE snapshot and truncates the coverage log.
+    """
     global TAG_COVERAGE
     p = get_tag_coverage_cache_path()
     try:
-        atomic_write_json(p, TAG_COVERAGE)
+        atomic_write_json(p, {tag: cov.to_json() for tag, cov in TAG_COVERAGE.items()})
+        atomic_write_json(get_tag_etags_path(),
+                          {tag: [[a, b, e] for (a, b), e in ets.items()] for tag, ets in TAG_ETAGS.items() if ets})
+        if os.path.exists(get_tag_coverage_log_path()):
+            os.remove(get_tag_coverage_log_path())
         python_logger.info("TAG_COVERAGE cached successfully.")
     except Exception as e:
         python_logger.error(f"Error caching TAG_COVERAGE: {e}")
 
+def append_tag_coverage(tag, iv=None, removed=False, etag=None):
+    """
+    Logs one coverage change (iv=None => tag dropped, removed=True => iv
+    uncovered, etag => the historian ETag of the fetched iv) instead of
+    rewriting TagCoverage.json; the log is folded into the snapshot by
+    compaction.
+    """
+    rec = {"tag": tag, "iv": list(iv) if iv else None}
+    if removed:
+        rec["rm"] = True
+    if etag:
+        rec["etag"] = etag
+    try:
+        with open(get_tag_coverage_log_path(), "a", encoding="utf-8") as f:
+            f.write(json.dumps(rec) + "\n")
+    except Exception as e:
+        python_logger.error(f"Error logging TAG_COVERAGE for {tag}: {e}")
+
 def load_tag_coverage():
+    """
+    Returns (TAG_COVERAGE, TAG_ETAGS) from their snapshots plus the coverage log.
+    """
+    coverage = {}
+    etags = {}
     p = get_tag_coverage_cache_path()
     if os.path.exists(p):
         try:
             with open(p, "r", encoding="utf-8") as f:
-                coverage = json.load(f)
+                coverage = {tag: CoverageIndex.from_json(d) for tag, d in json.load(f).items()}
             python_logger.info("Loaded TAG_COVERAGE from JSON cache.")
-            return coverage
         except Exception as e:
             python_logger.error(f"Error loading TAG_COVERAGE: {e}")
-    return {}
+    for tag, entries in (safe_load_json(get_tag_etags_path(), {}) or {}).items():
+        etags[tag] = {(int(a), int(b)): e for (a, b, e) in entries}
+    lp = get_tag_coverage_log_path()
+    if os.path.exists(lp):
+        with open(lp, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn last line
+                if rec.get("iv") is None:
+                    coverage.pop(rec["tag"], None)
+                    etags.pop(rec["tag"], None)
+                elif rec.get("rm"):
+                    if rec["tag"] in coverage:
+                        coverage[rec["tag"]].remove(*rec["iv"])
+                    drop_etags(etags, rec["tag"], *rec["iv"])
+                else:
+                    coverage.setdefault(rec["tag"], CoverageIndex()).add(*rec["iv"])
+                    if rec.get("etag"):
+                        record_etag(etags, rec["tag"], rec["iv"], rec["etag"])
+        python_logger.info("Replayed TAG_COVERAGE log.")
+    return coverage, etags
+
+def persist_raw_table_changes(deltas):
+    """
+    Persists one /fetch_data worth of changes. `deltas` maps tag => list of
+    (ts, vals) arrays that were merged; those are appended to the per-tag
+    logs. Anything else still dirty (dropped tags, non-append backends) goes
+    through the regular save.
+    """
+    global RAW_DIRTY_TAGS
+    cache = get_raw_cache()
+    if cache.supports_append:
+        for tag, parts in deltas.items():
+            try:
+                ts = np.concatenate([p[0] for p in parts])
+                vals = np.concatenate([p[1] for p in parts])
+                dtype = stored_dtype_name(RAW_TABLE[tag]) if RAW_TABLE is not None and tag in RAW_TABLE.columns else RAW_DEFAULT_DTYPE
+                if cache.append(tag, ts, vals, dtype):
+                    RAW_DIRTY_TAGS.discard(tag)
+            except Exception as e:
+                python_logger.error(f"Error appending RAW_TABLE rows for {tag}: {e}")
+    if RAW_DIRTY_TAGS:
+        save_raw_table_cache()
+
+###############################################################################
+# BACKGROUND COMPACTION
+###############################################################################
+COMPACTION_INTERVAL_SECONDS = 300
+COMPACTION_WAL_BYTES = 16_000_000
+
+def compact_caches():
+    """
+    Folds the append logs (RAW_TABLE rows, TAG_COVERAGE) into the main cache,
+    saves RAW_TABLE columns still marked dirty and writes WorkingTable.json
+    after full rebuilds. Snapshots are taken under global_lock, the writes
+    happen outside it.
+    """
+    global WT_CACHE_DIRTY
+    cache = get_raw_cache()
+    with global_lock:
+        if os.path.exists(get_tag_coverage_log_path()):
+            save_tag_coverage()
+        wt = WORKING_TABLE.copy() if WT_CACHE_DIRTY and WORKING_TABLE is not None else None
+        WT_CACHE_DIRTY = False
+        dirty = set(RAW_DIRTY_TAGS)
+        raw = None
+        if dirty and RAW_TABLE is not None:
+            reload_evicted_blocks([k for k in EVICTED_BLOCKS if k[0] in dirty])
+            # the columnar store rewrites only the dirty tags, the json one everything
+            cols = [c for c in RAW_TABLE.columns if c == "NumericTimestamp" or c in dirty]
+            raw = RAW_TABLE[cols].copy() if cache.supports_append else RAW_TABLE.copy()
+            RAW_DIRTY_TAGS.clear()
+    if raw is not None:
+        try:
+            cache.save(raw, dirty)
+            python_logger.info(f"Saved {len(dirty)} dirty RAW_TABLE columns.")
+        except Exception as e:
+            python_logger.error(f"Error caching RAW_TABLE: {e}")
+            with global_lock:
+                RAW_DIRTY_TAGS.update(dirty)
+    save_working_table_cache(wt)
+    n = cache.compact()
+    if n:
+        python_logger.info(f"Compacted append logs for {n} tags.")
+
+def compaction_worker():
+    last = time.time()
+    while True:
+        time.sleep(10)
+        try:
+            cache = get_raw_cache()
+            over_budget = cache.supports_append and cache.wal_bytes() >= COMPACTION_WAL_BYTES
+            if over_budget or time.time() - last >= COMPACTION_INTERVAL_SECONDS:
+                compact_caches()
+                last = time.time()
+        except Exception as e:
+            python_logger.error(f"Cache compaction error: {e}")
 
 ###############################################################################
 # SIGNATURE HELPER (to detect if RAW_TABLE changed)
@@ -266,26 +841,122 @@ def get_raw_table_signature(df: pd.DataFrame):
 ###############################################################################
 # INTERVAL HELPERS
 ###############################################################################
-def union_intervals(intervals):
-    if not intervals:
-        return []
-    sorted_iv = sorted(intervals, key=lambda x: x[0])
-    merged = [sorted_iv[0]]
-    for i in range(1, len(sorted_iv)):
-        cur = sorted_iv[i]
-        last = merged[-1]
-        if cur[0] <= last[1]:
-            merged[-1] = (last[0], max(last[1], cur[1]))
-        else:
-            merged.append(cur)
-    return merged
+class CoverageIndex:
+    """
+    Fetched time ranges of one tag: disjoint closed [start, end] intervals
+    (unix seconds) kept as sorted numpy arrays. Overlapping or touching
+    inserts coalesce, and gap queries bisect instead of walking a list.
+    """
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, intervals=()):
+        self.starts = np.empty(0, dtype=np.int64)
+        self.ends = np.empty(0, dtype=np.int64)
+        for (st, en) in intervals:
+            self.add(st, en)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, st, en):
+        st, en = int(st), int(en)
+        if en < st:
+            return
+        i = int(np.searchsorted(self.ends, st, side="left"))     # first ending at/after st
+        j = int(np.searchsorted(self.starts, en, side="right"))  # first starting after en
+        if i < j:
+            st = min(st, int(self.starts[i]))
+            en = max(en, int(self.ends[j - 1]))
+        self.starts = np.concatenate([self.starts[:i], [st], self.starts[j:]])
+        self.ends = np.concatenate([self.ends[:i], [en], self.ends[j:]])
+
+    def remove(self, st, en):
+        """
+        Uncovers (st, en); intervals straddling its edges are cut at st / en.
+        """
+        st, en = int(st), int(en)
+        if en <= st or not len(self):
+            return
+        i = int(np.searchsorted(self.ends, st, side="right"))   # first ending after st
+        j = int(np.searchsorted(self.starts, en, side="left"))  # first starting at/after en
+        if i >= j:
+            return
+        keep_s, keep_e = [], []
+        if self.starts[i] < st:
+            keep_s.append(int(self.starts[i]))
+            keep_e.append(st)
+        if self.ends[j - 1] > en:
+            keep_s.append(en)
+            keep_e.append(int(self.ends[j - 1]))
+        self.starts = np.concatenate([self.starts[:i], np.array(keep_s, dtype=np.int64), self.starts[j:]])
+        self.ends = np.concatenate([self.ends[:i], np.array(keep_e, dtype=np.int64), self.ends[j:]])
+
+    def gaps(self, st, en):
+        """
+        Sub-intervals of (st, en) not covered, as [(start, end), ...].
+        """
+        i = int(np.searchsorted(self.ends, st, side="left"))
+        j = int(np.searchsorted(self.starts, en, side="right"))
+        lo = np.concatenate([[st], self.ends[i:j]])
+        hi = np.concatenate([self.starts[i:j], [en]])
+        lo = np.maximum(lo, st)
+        hi = np.minimum(hi, en)
+        keep = hi > lo
+        return [(int(a), int(b)) for a, b in zip(lo[keep], hi[keep])]
+
+    def intervals(self):
+        return list(zip(self.starts.tolist(), self.ends.tolist()))
+
+    def to_json(self):
+        # flat [s0, e0, s1, e1, ...]
+        return np.column_stack([self.starts, self.ends]).ravel().tolist()
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Accepts the flat form and the older list of [start, end] pairs.
+        """
+        if data and isinstance(data[0], (list, tuple)):
+            return cls(data)
+        flat = np.asarray(data or [], dtype=np.int64).reshape(-1, 2)
+        return cls(flat[np.argsort(flat[:, 0], kind="stable")].tolist())
+
+def drop_etags(etags, tag, st, en):
+    """
+    Forgets the ETags of tag's chunks overlapping (st, en).
+    """
+    known = etags.get(tag)
+    if known:
+        for iv in [iv for iv in known if iv[0] < en and iv[1] > st]:
+            del known[iv]
+
+def record_etag(etags, tag, iv, etag):
+    st, en = int(iv[0]), int(iv[1])
+    drop_etags(etags, tag, st, en)
+    etags.setdefault(tag, {})[(st, en)] = etag
 
-def remove_tag_coverage(tag):
-    global TAG_COVERAGE, RAW_TABLE
-    if tag in TAG_COVERAGE:
-        del TAG_COVERAGE[tag]
-    if RAW_TABLE is not None and not RAW_TABLE.empty and tag in RAW_TABLE.columns:
-        RAW_TABLE.drop(columns=[tag], inplace=True, errors="ignore")
+def revalidation_chunks(tag, st, en):
+    """
+    Covered parts of (st, en) for tag as [((st, en), etag or None), ...]:
+    chunks with a stored ETag are re-requested conditionally as they were
+    fetched, the rest (cached before ETags or by a historian without them)
+    unconditionally on the FETCH_CHUNK_SECONDS grid.
+    """
+    cov = TAG_COVERAGE.get(tag)
+    if cov is None or not len(cov):
+        return []
+    out = []
+    known = CoverageIndex()
+    for iv, etag in (TAG_ETAGS.get(tag) or {}).items():
+        if iv[0] < en and iv[1] > st and not cov.gaps(*iv):
+            out.append((iv, etag))
+            known.add(*iv)
+    gaps = cov.gaps(st, en)
+    edges = [st] + [x for g in gaps for x in g] + [en]
+    for a, b in zip(edges[::2], edges[1::2]):
+        for (ka, kb) in known.gaps(a, b) if b > a else []:
+            out.extend((iv, None) for iv in split_interval(ka, kb))
+    return out
 
 ###############################################################################
 # LOGGING ENDPOINT
@@ -316,6 +987,142 @@ def root():
 def serve_static(fname):
     return send_from_directory(DATA_DIR, fname)
 
+###############################################################################
+# HISTORIAN CLIENT (pooled keep-alive session)
+###############################################################################
+class HistorianClient:
+    """
+    Shared requests.Session for the historian: bounded keep-alive pool,
+    retries with backoff on connection errors and 429/5xx, (connect, read)
+    timeouts, plus latency and connection counters for the logs.
+    """
+    def __init__(self, pool_size=HISTORIAN_POOL_SIZE, max_hosts=HISTORIAN_MAX_HOSTS,
+                 connect_timeout=HISTORIAN_CONNECT_TIMEOUT, read_timeout=HISTORIAN_READ_TIMEOUT,
+                 retries=HISTORIAN_RETRIES, backoff=HISTORIAN_BACKOFF):
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=retries, connect=retries, read=retries, status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST"]),  # POST only carries batch reads
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=pool_size,
+                                   max_retries=retry, pool_block=True)
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.lock = Lock()
+        self.requests = 0
+        self.errors = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.not_modified = 0
+        self.caps = None
+        self.caps_failed_at = None
+        self.caps_lock = Lock()  # one probe at a time; self.lock is taken inside request()
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        t0 = time.perf_counter()
+        try:
+            r = self.session.request(method, url, **kwargs)
+            r.raise_for_status()
+            if r.status_code == 304:
+                with self.lock:
+                    self.not_modified += 1
+            return r
+        except Exception:
+            with self.lock:
+                self.errors += 1
+            raise
+        finally:
+            dt = time.perf_counter() - t0
+            with self.lock:
+                self.requests += 1
+                self.latency_total += dt
+                self.latency_max = max(self.latency_max, dt)
+                log_now = self.requests % HISTORIAN_STATS_EVERY == 0
+            if log_now:
+                self.log_stats()
+
+    def capabilities(self):
+        """
+        The historian's /capabilities document, fetched once. Historians
+        without the endpoint get {} (legacy formats only); after other
+        failures {} is used for HISTORIAN_CAPS_RETRY_SECONDS before asking
+        again, so an unreachable historian does not cost every fetch an
+        extra retried request. Concurrent fetch workers wait for a single
+        probe.
+        """
+        if self.caps is not None:
+            return self.caps
+        with self.caps_lock:
+            if self.caps is not None:
+                return self.caps
+            if self.caps_failed_at is not None and time.time() - self.caps_failed_at < HISTORIAN_CAPS_RETRY_SECONDS:
+                return {}
+            try:
+                caps = self.get(EXTERNAL_CAPABILITIES_URL).json()
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code not in (404, 405, 501):
+                    self.caps_failed_at = time.time()
+                    return {}
+                caps = {}
+            except Exception as e:
+                python_logger.warning(f"Historian capabilities unavailable: {e}")
+                self.caps_failed_at = time.time()
+                return {}
+            self.caps = caps if isinstance(caps, dict) else {}
+            python_logger.info(f"Historian capabilities: {self.caps}")
+            return self.caps
+
+    def values_params(self):
+        """
+        Extra /values and /values_batch parameters selecting the cheapest
+        wire format the historian advertises: integer epoch ms dates and
+        columnar {"t": [...], "v": [...]} bodies.
+        """
+        caps = self.capabilities()
+        params = {}
+        if "epoch_ms" in caps.get("dateFormats", []):
+            params["dateFormat"] = "epoch_ms"
+        if "columnar" in caps.get("layouts", []):
+            params["layout"] = "columnar"
+        return params
+
+    def stats(self):
+        # urllib3 counts connections opened per pool: opened vs requests is the churn
+        opened = 0
+        pooled_requests = 0
+        for key in list(self.adapter.poolmanager.pools.keys()):
+            pool = self.adapter.poolmanager.pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                pooled_requests += pool.num_requests
+        with self.lock:
+            n = self.requests
+            return {
+                "requests": n,
+                "errors": self.errors,
+                "not_modified": self.not_modified,
+                "avg_latency_ms": round(1000 * self.latency_total / n, 1) if n else 0.0,
+                "max_latency_ms": round(1000 * self.latency_max, 1),
+                "connections_opened": opened,
+                "http_requests": pooled_requests,
+            }
+
+    def log_stats(self):
+        python_logger.info(f"Historian client stats: {self.stats()}")
+
+HISTORIAN = HistorianClient()
+
 ###############################################################################
 # TAGLIST
 ###############################################################################
@@ -341,8 +1148,7 @@ def taglist():
 
     try:
         python_logger.info("Fetching new taglist from external source...")
-        r = requests.get(EXTERNAL_TAGLIST_URL, timeout=15)
-        r.raise_for_status()
+        r = HISTORIAN.get(EXTERNAL_TAGLIST_URL)
         data = r.json()
         atomic_write_json(cachep, data)
         TAGLIST_CACHE = data
@@ -360,143 +1166,1015 @@ def taglist():
             return jsonify(TAGLIST_CACHE)
         return jsonify([])
 
+###############################################################################
+# RAW_TABLE COLUMN TYPES (from the taglist RegisterDataType)
+###############################################################################
+RAW_DTYPE_LIMITS = {"UInt16": (0, 65535), "UInt32": (0, 4294967295), "boolean": (0, 1)}
+
+# Tags whose samples did not fit their register type; kept as float64
+RAW_WIDENED = set()
+_REGISTER_TYPES = (None, {})
+
+def tag_register_types():
+    """
+    {tag: RegisterDataType} from the taglist (the disk cache if /taglist
+    has not been called yet this session).
+    """
+    global TAGLIST_CACHE, _REGISTER_TYPES
+    if TAGLIST_CACHE is None:
+        TAGLIST_CACHE = safe_load_json(get_taglist_cache_path(), None)
+    if _REGISTER_TYPES[0] is not TAGLIST_CACHE:
+        types = {t.get("Tag"): t.get("RegisterDataType") for t in (TAGLIST_CACHE or []) if isinstance(t, dict)}
+        _REGISTER_TYPES = (TAGLIST_CACHE, types)
+    return _REGISTER_TYPES[1]
+
+def raw_dtype(tag):
+    if tag in RAW_WIDENED:
+        return RAW_DEFAULT_DTYPE
+    return RAW_DTYPES.get(tag_register_types().get(tag), RAW_DEFAULT_DTYPE)
+
+def raw_float_values(vals, err=None):
+    """
+    RAW_TABLE column of any dtype => float64 array, NaN for missing samples
+    and for the error value (matched at the column's own precision).
+    """
+    if vals.dtype == object:
+        out = pd.to_numeric(vals, errors="coerce").to_numpy(dtype=np.float64, copy=True)
+    else:
+        out = vals.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    if err is not None:
+        hit = out == err
+        if vals.dtype == np.float32:
+            hit |= vals.to_numpy() == np.float32(err)
+        out[hit] = np.nan
+    return out
+
+def typed_values(tag, vals):
+    """
+    Casts a column of samples to raw_dtype(tag). A tag whose samples do not
+    fit (fractions or out of range for an integer/boolean register) is
+    widened to float64 for the rest of the session instead.
+    """
+    dt = raw_dtype(tag)
+    if str(vals.dtype) == dt:
+        return vals
+    f = raw_float_values(vals)
+    if dt in RAW_DTYPE_LIMITS:
+        lo, hi = RAW_DTYPE_LIMITS[dt]
+        ok = f[~np.isnan(f)]
+        if ok.size and (ok.min() < lo or ok.max() > hi or np.any(ok != np.floor(ok))):
+            dt = RAW_DEFAULT_DTYPE
+    elif dt == "float32":
+        with np.errstate(over="ignore"):
+            if np.any(np.isinf(f.astype(np.float32)) & np.isfinite(f)):
+                dt = RAW_DEFAULT_DTYPE
+    if dt != raw_dtype(tag):
+        RAW_WIDENED.add(tag)
+        python_logger.info(f"Samples of {tag} do not fit {tag_register_types().get(tag)}; storing as float64.")
+    return pd.Series(f, index=vals.index, name=vals.name).astype(dt)
+
+def stored_dtype_name(col):
+    return str(col.dtype) if str(col.dtype) in RAW_DTYPES.values() else RAW_DEFAULT_DTYPE
+
+def conform_raw_dtypes(df, cols):
+    """
+    Re-types columns of df that are not stored as raw_dtype(tag), e.g.
+    after a concat with missing rows upcast them.
+    """
+    for c in cols:
+        if str(df[c].dtype) != raw_dtype(c):
+            df[c] = typed_values(c, df[c])
+    return df
+
 ###############################################################################
 # FETCH SINGLE TAG
 ###############################################################################
-def fetch_values(tag, st, en):
+def read_values(r, columnar=False):
+    """
+    /values body [{"Date", "Value"}, ...] => {"Date": [...], "Value": [...]}.
+    Columnar bodies {"t": [...], "v": [...]} are returned as they are.
+    """
+    if columnar:
+        return r.json()
+    arr = r.json()
+    return {"Date": [d.get("Date") for d in arr], "Value": [d.get("Value") for d in arr]}
+
+def fetch_values(tag, st, en, etag=None):
+    """
+    (tag, {"Date": [...], "Value": [...], "etag": ...}) or columnar {"t", "v", "etag"};
+    with the etag of a cached copy, a 304 gives (tag, {"etag": ..., "notModified": True}).
+    (tag, []) when the call failed.
+    """
+    params = {"tag": tag, "startDateUnixSeconds": st, "endDateUnixSeconds": en}
+    params.update(HISTORIAN.values_params())
+    headers = {"If-None-Match": etag} if etag else None
     try:
-        r = requests.get(
-            EXTERNAL_VALUES_URL,
-            params={"tag": tag, "startDateUnixSeconds": st, "endDateUnixSeconds": en},
-            timeout=15
-        )
-        r.raise_for_status()
-        return tag, r.json()
+        with HISTORIAN.get(EXTERNAL_VALUES_URL, params=params, headers=headers) as r:
+            if r.status_code == 304:
+                return tag, {"etag": r.headers.get("ETag", etag), "notModified": True}
+            data = read_values(r, params.get("layout") == "columnar")
+            data["etag"] = r.headers.get("ETag")
+            return tag, data
     except Exception as e:
         python_logger.error(f"fetch_values failed for {tag} ({st}-{en}): {e}")
         return tag, []
 
+# Cleared the first time the historian answers /values_batch with 404/405/501
+EXTERNAL_BATCH_SUPPORTED = True
+
+class BatchNotSupported(Exception):
+    pass
+
+def fetch_values_batch(tags, st, en, etags=None):
+    """
+    One /values_batch call for tags sharing (st, en).
+    Returns {tag: {"Date": [...], "Value": [...], "etag": ...}} (or {"t", "v"} columns);
+    tags whose cached etag (etags {tag: etag}) still matches come back as
+    {"etag": ..., "notModified": True}.
+    """
+    body = {"tags": list(tags), "startDateUnixSeconds": st, "endDateUnixSeconds": en}
+    body.update(HISTORIAN.values_params())
+    if etags:
+        body["ifNoneMatch"] = etags
+    try:
+        r = HISTORIAN.post(EXTERNAL_VALUES_BATCH_URL, json=body)
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code in (404, 405, 501):
+            raise BatchNotSupported() from e
+        raise
+    with r:
+        data = r.json().get("tags", {})
+    # "notModified" entries are the batch form of a 304
+    unchanged = sum(1 for v in data.values() if isinstance(v, dict) and v.get("notModified"))
+    if unchanged:
+        with HISTORIAN.lock:
+            HISTORIAN.not_modified += unchanged
+    return data
+
+###############################################################################
+# FETCH PIPELINE (persistent pool, de-duplicated in-flight fetches)
+###############################################################################
+FETCH_MAX_WORKERS = HISTORIAN_POOL_SIZE
+FETCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=FETCH_MAX_WORKERS, thread_name_prefix="historian-fetch"
+)
+INFLIGHT_FETCHES = {}  # (tag, st, en, etag) => Future of fetch_values
+INFLIGHT_LOCK = Lock()
+
+def submit_fetch(tag, st, en, etag=None):
+    """
+    Returns the in-flight future for (tag, st, en, etag), starting one if
+    there is none, so concurrent /fetch_data requests share a single
+    historian call.
+    """
+    key = (tag, st, en, etag)
+    with INFLIGHT_LOCK:
+        fut = INFLIGHT_FETCHES.get(key)
+        if fut is not None:
+            return fut
+        fut = FETCH_EXECUTOR.submit(fetch_values, tag, st, en, etag)
+        INFLIGHT_FETCHES[key] = fut
+    fut.add_done_callback(lambda f: forget_fetch(key, f))
+    return fut
+
+def forget_fetch(key, fut):
+    with INFLIGHT_LOCK:
+        if INFLIGHT_FETCHES.get(key) is fut:
+            del INFLIGHT_FETCHES[key]
+
+def submit_fetch_batch(tags, st, en, etags=None):
+    """
+    Per-tag futures (resolving to (tag, data) like fetch_values) for tags
+    sharing (st, en). Tags not already in flight are fetched together with
+    one /values_batch call; etags {tag: etag} makes theirs conditional.
+    """
+    etags = etags or {}
+    out = {}
+    new = []
+    with INFLIGHT_LOCK:
+        for tg in tags:
+            key = (tg, st, en, etags.get(tg))
+            fut = INFLIGHT_FETCHES.get(key)
+            if fut is None:
+                fut = concurrent.futures.Future()
+                INFLIGHT_FETCHES[key] = fut
+                new.append(tg)
+            out[tg] = fut
+    for tg in new:
+        out[tg].add_done_callback(lambda f, key=(tg, st, en, etags.get(tg)): forget_fetch(key, f))
+    if new:
+        known = {tg: etags[tg] for tg in new if etags.get(tg)}
+        FETCH_EXECUTOR.submit(run_fetch_batch, new, st, en, {tg: out[tg] for tg in new}, known)
+    return out
+
+def run_fetch_batch(tags, st, en, futs, etags=None):
+    global EXTERNAL_BATCH_SUPPORTED
+    etags = etags or {}
+    try:
+        data = fetch_values_batch(tags, st, en, etags)
+    except BatchNotSupported:
+        EXTERNAL_BATCH_SUPPORTED = False
+        python_logger.info("Historian has no /values_batch endpoint, using per-tag /values calls.")
+        for tg in tags:
+            FETCH_EXECUTOR.submit(fetch_values, tg, st, en, etags.get(tg)).add_done_callback(
+                lambda f, tg=tg: futs[tg].set_result(f.result())
+            )
+        return
+    except Exception as e:
+        python_logger.error(f"fetch_values_batch failed for {len(tags)} tags ({st}-{en}): {e}")
+        data = {}
+    for tg in tags:
+        futs[tg].set_result((tg, data.get(tg, [])))
+
+def submit_fetches(missing_by_range, etags=None):
+    """
+    missing_by_range: {(st, en): [tag, ...]} => [(future, tag, st, en), ...].
+    Tags sharing a range go out as batch calls while the historian supports them.
+    etags {(tag, st, en): etag} makes those chunks conditional re-fetches.
+    """
+    etags = etags or {}
+    futs = []
+    for (miS, miE), tags in missing_by_range.items():
+        known = {tg: etags[(tg, miS, miE)] for tg in tags if etags.get((tg, miS, miE))}
+        if EXTERNAL_BATCH_SUPPORTED and len(tags) > 1:
+            for i in range(0, len(tags), HISTORIAN_BATCH_MAX_TAGS):
+                for tg, fut in submit_fetch_batch(tags[i:i + HISTORIAN_BATCH_MAX_TAGS], miS, miE, known).items():
+                    futs.append((fut, tg, miS, miE))
+        else:
+            for tg in tags:
+                futs.append((submit_fetch(tg, miS, miE, known.get(tg)), tg, miS, miE))
+    return futs
+
+def split_interval(st, en, chunk=FETCH_CHUNK_SECONDS):
+    """
+    Splits (st, en) on the absolute chunk grid, so overlapping requests
+    produce identical (de-duplicable) chunks.
+    """
+    out = []
+    a = st
+    while a < en:
+        b = min(en, (a // chunk + 1) * chunk)
+        out.append((a, b))
+        a = b
+    return out
+
+###############################################################################
+# HISTORIAN RESPONSE DECODING (dates => int64 ms, values => float64)
+###############################################################################
+DATE_NAT = np.iinfo(np.int64).min  # decode_dates result for unparseable entries
+
+# Fixed-width layouts: (name, separator positions => allowed bytes, digit fields)
+ISO_SEPARATORS = {4: b"-", 7: b"-", 10: b"T ", 13: b":", 16: b":"}
+UNIX_SEPARATORS = {2: b":", 5: b":", 10: b":", 13: b":", 16: b":"}
+ISO_FIELDS = {"y": (0, 4), "mo": (5, 7), "d": (8, 10), "h": (11, 13), "mi": (14, 16), "s": (17, 19)}
+UNIX_FIELDS = {"d": (0, 2), "mo": (3, 5), "y": (6, 10), "h": (11, 13), "mi": (14, 16), "s": (17, 19)}
+
+def date_layout(first):
+    """
+    Detects the layout of one date string (bytes): ISO 8601
+    "YYYY-MM-DDTHH:MM:SS[.fff][Z|+HH:MM]" or the historian's unix format
+    "dd:mm:yyyy:hh:mm:ss". Returns (separators, fields, frac_digits,
+    tz_len, length) or None.
+    """
+    n = len(first)
+    if n < 19:
+        return None
+    for seps, fields in ((ISO_SEPARATORS, ISO_FIELDS), (UNIX_SEPARATORS, UNIX_FIELDS)):
+        if all(first[i:i + 1] and first[i:i + 1] in allowed for i, allowed in seps.items()):
+            break
+    else:
+        return None
+    pos = 19
+    frac = 0
+    if fields is ISO_FIELDS and first[pos:pos + 1] == b".":
+        while pos + 1 + frac < n and first[pos + 1 + frac:pos + 2 + frac].isdigit():
+            frac += 1
+        if not frac:
+            return None
+        pos += 1 + frac
+    tz = n - pos
+    if tz == 1 and first[pos:] == b"Z":
+        pass
+    elif not (tz == 0 or (tz == 6 and first[pos:pos + 1] in b"+-" and first[pos + 3:pos + 4] == b":")):
+        return None
+    return seps, fields, frac, tz, n
+
+def days_from_civil(y, m, d):
+    """
+    Proleptic Gregorian (y, m, d) arrays => days since 1970-01-01.
+    """
+    y = y - (m <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * ((m + 9) % 12) + 2) // 5 + d - 1
+    return era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
+
+def decode_dates(dates):
+    """
+    Historian date strings => int64 epoch ms (DATE_NAT where unparseable).
+    The layout is detected once from the first entry; entries of that exact
+    layout are decoded together from a fixed-width uint8 digit matrix, and
+    anything else falls back to pd.to_datetime. Naive times are UTC.
+    Numeric dates (dateFormat=epoch_ms) are taken as epoch ms directly.
+    """
+    n = len(dates)
+    out = np.full(n, DATE_NAT, dtype=np.int64)
+    if not n:
+        return out
+    first = next((d for d in dates if d is not None), None)
+    if isinstance(first, (int, float, np.number)) and not isinstance(first, bool):
+        ms = decode_values(dates)
+        good = ~np.isnan(ms)
+        out[good] = ms[good].astype(np.int64)
+        return out
+    ok = np.zeros(n, dtype=bool)
+    try:
+        raw = np.array(dates, dtype="S")
+    except (UnicodeEncodeError, ValueError):
+        raw = None
+    layout = None
+    if raw is not None:
+        layout = next((lay for lay in map(date_layout, map(bytes, raw[:8])) if lay is not None), None)
+    if layout is not None:
+        seps, fields, frac, tz, length = layout
+        width = raw.dtype.itemsize
+        m = raw.view(np.uint8).reshape(n, width)
+        ok = np.ones(n, dtype=bool) if width == length else (m[:, length:] == 0).all(axis=1)
+        m = m[:, :length]
+        for i, allowed in seps.items():
+            col = m[:, i]
+            ok &= np.isin(col, np.frombuffer(allowed, dtype=np.uint8))
+        if frac:
+            ok &= m[:, 19] == ord(".")
+        dig = m - np.uint8(48)  # non-digits wrap around to > 9
+
+        def num(a, b):
+            v = dig[:, a].astype(np.int64)
+            for i in range(a + 1, b):
+                v = v * 10 + dig[:, i]
+            return v
+
+        digit_cols = [i for (a, b) in fields.values() for i in range(a, b)]
+        if frac:
+            digit_cols += list(range(20, 20 + frac))
+        tz_at = length - tz
+        if tz == 6:
+            digit_cols += [tz_at + 1, tz_at + 2, tz_at + 4, tz_at + 5]
+            ok &= np.isin(m[:, tz_at], np.frombuffer(b"+-", dtype=np.uint8)) & (m[:, tz_at + 3] == ord(":"))
+        elif tz == 1:
+            ok &= m[:, tz_at] == ord("Z")
+        ok &= (dig[:, digit_cols] <= 9).all(axis=1)
+
+        f = {k: num(a, b) for k, (a, b) in fields.items()}
+        days = days_from_civil(f["y"], f["mo"], f["d"])
+        month_days = days_from_civil(f["y"] + f["mo"] // 12, f["mo"] % 12 + 1, 1) - days_from_civil(f["y"], f["mo"], 1)
+        ok &= (f["mo"] >= 1) & (f["mo"] <= 12) & (f["d"] >= 1) & (f["d"] <= month_days)
+        ok &= (f["h"] <= 23) & (f["mi"] <= 59) & (f["s"] <= 59)
+        ms = (((days * 24 + f["h"]) * 60 + f["mi"]) * 60 + f["s"]) * 1000
+        if frac:
+            ms += num(20, 20 + min(frac, 3)) * 10 ** (3 - min(frac, 3))
+        if tz == 6:
+            off = (num(tz_at + 1, tz_at + 3) * 60 + num(tz_at + 4, tz_at + 6)) * 60000
+            ms -= np.where(m[:, tz_at] == ord("-"), -off, off)
+        out[ok] = ms[ok]
+    if not ok.all():
+        rest = np.flatnonzero(~ok)
+        fmt = "%d:%m:%Y:%H:%M:%S" if layout is not None and layout[1] is UNIX_FIELDS else "ISO8601"
+        parsed = pd.to_datetime(pd.Series([dates[i] for i in rest], dtype=object),
+                                format=fmt, errors="coerce", utc=True)
+        good = parsed.notna().to_numpy()
+        out[rest[good]] = parsed[good].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    return out
+
+def decode_values(values):
+    """
+    Historian values => float64 array; None, non-numeric and inf become NaN.
+    """
+    try:
+        v = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        v = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+    v[np.isinf(v)] = np.nan
+    return v
+
+def parse_values(tag, arr):
+    """
+    Historian [{"Date", "Value"}, ...] (or columnar {"Date": [...], "Value": [...]}
+    / {"t": [...], "v": [...]})
+    => DataFrame ["NumericTimestamp", tag] sorted by time with the tag's
+    RAW_TABLE dtype, or None when there is nothing to merge. Samples whose
+    date does not parse are dropped.
+    """
+    if not arr:
+        return None
+    if isinstance(arr, dict):
+        dates = arr.get("Date", arr.get("t")) or []
+        vals = arr.get("Value", arr.get("v")) or []
+    else:
+        dates = [d.get("Date") for d in arr]
+        vals = [d.get("Value") for d in arr]
+    if not len(dates):
+        return None
+    ts = decode_dates(dates)
+    v = decode_values(vals)
+    keep = ts != DATE_NAT
+    if not keep.all():
+        ts, v = ts[keep], v[keep]
+        if not len(ts):
+            return None
+    if np.any(ts[1:] < ts[:-1]):
+        order = np.argsort(ts, kind="stable")
+        ts, v = ts[order], v[order]
+    df = pd.DataFrame({"NumericTimestamp": ts, tag: v})
+    df[tag] = typed_values(tag, df[tag])
+    return df
+
 ###############################################################################
 # MERGE => RAW_TABLE
 ###############################################################################
+def build_merge_batch(frames_by_tag):
+    """
+    Combines the fetched frames of one request ({tag: [df, ...]} with columns
+    ["NumericTimestamp", tag]) into a single wide frame sorted by
+    NumericTimestamp, so RAW_TABLE is merged once per request.
+    """
+    series = []
+    for tag, frames in frames_by_tag.items():
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        df = df.drop_duplicates("NumericTimestamp", keep="last")
+        series.append(pd.Series(df[tag].array, index=df["NumericTimestamp"].to_numpy(), name=tag))
+    wide = pd.concat(series, axis=1).sort_index()
+    wide.index.name = "NumericTimestamp"
+    return wide.reset_index()
+
 def merge_new_data_into_raw_table(df_new):
     """
-    Merges df_new (with columns ["NumericTimestamp","Timestamp","tagName"]) into RAW_TABLE
+    Merges df_new (columns ["NumericTimestamp", tag, ...]) into RAW_TABLE
     overwriting old data if there's overlap in the same timestamps.
+
+    Both sides are sorted by NumericTimestamp, so data strictly after the
+    tail (or before the head) is appended and overlaps are spliced into the
+    searchsorted row range only.
     """
-    global RAW_TABLE
+    global RAW_TABLE, RAW_DIRTY_TAGS, RAW_DIRTY_FROM
+    value_cols = [c for c in df_new.columns if c not in ("Timestamp", "NumericTimestamp")]
+    RAW_DIRTY_TAGS.update(value_cols)
+    df_new = df_new.drop(columns=["Timestamp"], errors="ignore")
+    if df_new.empty:
+        return
+    df_new = conform_raw_dtypes(df_new.copy(), value_cols)
+    if not df_new["NumericTimestamp"].is_monotonic_increasing:
+        df_new = df_new.sort_values("NumericTimestamp", kind="stable")
+    df_new = df_new.drop_duplicates("NumericTimestamp", keep="last").reset_index(drop=True)
+    first_ts = int(df_new["NumericTimestamp"].iloc[0])
+    RAW_DIRTY_FROM = first_ts if RAW_DIRTY_FROM is None else min(RAW_DIRTY_FROM, first_ts)
+
+    last_ts = int(df_new["NumericTimestamp"].iloc[-1])
+
     if RAW_TABLE is None or RAW_TABLE.empty:
-        RAW_TABLE = df_new.sort_values("NumericTimestamp").reset_index(drop=True)
+        RAW_TABLE = df_new
+        update_rollups(value_cols, first_ts, last_ts)
         return
 
-    combined = pd.merge(
-        RAW_TABLE,
-        df_new,
-        on="NumericTimestamp",
-        how="outer",
-        suffixes=("", "_new")
-    )
+    for c in value_cols:
+        if c not in RAW_TABLE.columns:
+            RAW_TABLE[c] = pd.Series(np.nan, index=RAW_TABLE.index).astype(df_new[c].dtype)
+    cols = RAW_TABLE.columns
+    # columns absent from df_new keep their RAW_TABLE dtype through the concat
+    others = {c: RAW_TABLE[c].dtype for c in cols if c != "NumericTimestamp" and c not in value_cols}
+
+    raw_ts = RAW_TABLE["NumericTimestamp"].to_numpy()
+    new_ts = df_new["NumericTimestamp"].to_numpy()
+
+    if new_ts[0] > raw_ts[-1] or new_ts[-1] < raw_ts[0]:
+        # Fast path: no overlap, just append (or prepend)
+        df_new = df_new.reindex(columns=cols).astype(others)
+        parts = [RAW_TABLE, df_new] if new_ts[0] > raw_ts[-1] else [df_new, RAW_TABLE]
+        RAW_TABLE = conform_raw_dtypes(pd.concat(parts, ignore_index=True), value_cols)
+        update_rollups(value_cols, first_ts, last_ts)
+        return
 
-    for c in df_new.columns:
-        if c in ("Timestamp", "NumericTimestamp"):
-            continue
-        new_col = c + "_new"
-        if new_col in combined.columns:
-            # Overwrite old with new if new is not NaN
-            combined[c] = combined[c].where(combined[new_col].isna(), combined[new_col])
-            combined.drop(columns=[new_col], inplace=True)
-
-    if "Timestamp_new" in combined.columns:
-        combined.drop(columns=["Timestamp_new"], inplace=True)
-
-    # Rebuild consistent "Timestamp" from NumericTimestamp
-    combined["Timestamp"] = combined["NumericTimestamp"].apply(
-        lambda x: fmt_timestamp(pd.to_datetime(x, unit="ms"))
-    )
-    combined.sort_values("NumericTimestamp", inplace=True)
-    combined.reset_index(drop=True, inplace=True)
-    RAW_TABLE = combined
+    # Overlap: splice only the affected row range
+    lo = int(np.searchsorted(raw_ts, new_ts[0], side="left"))
+    hi = int(np.searchsorted(raw_ts, new_ts[-1], side="right"))
+    mid_old = RAW_TABLE.iloc[lo:hi].set_index("NumericTimestamp")
+    # Overwrite old with new if new is not NaN
+    mid = df_new.set_index("NumericTimestamp").combine_first(mid_old)
+    mid = mid.reset_index().reindex(columns=cols).astype(others)
+    mid = conform_raw_dtypes(mid, value_cols)
+    RAW_TABLE = conform_raw_dtypes(pd.concat([RAW_TABLE.iloc[:lo], mid, RAW_TABLE.iloc[hi:]], ignore_index=True),
+                                   value_cols)
+    update_rollups(value_cols, first_ts, last_ts)
+
+###############################################################################
+# ROLLUP PYRAMID (per-tag pre-aggregated levels)
+###############################################################################
+ROLLUP_LEVELS_MS = (60_000, 600_000, 3_600_000)
+ROLLUP_FIELDS = ("min", "max", "sum", "count", "last")
+
+# {tag: {"err": error value masked out, "levels": {width_ms: DataFrame}}}
+# Indexed by raw bucket start ms; built on first use, then kept up to date
+# by merge_new_data_into_raw_table.
+ROLLUPS = {}
+
+def rollup_reduce(bucket, parts):
+    """
+    Reduces (min, max, sum, count, last) arrays grouped by the sorted bucket keys.
+    """
+    if not len(bucket):
+        return pd.DataFrame({f: np.array([], dtype=np.int64 if f == "count" else np.float64)
+                             for f in ROLLUP_FIELDS}, index=pd.Index(bucket, name="bucket"))
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bucket)] - 1
+    mn, mx, sm, ct, last = parts
+    return pd.DataFrame({
+        "min": np.minimum.reduceat(mn, starts),
+        "max": np.maximum.reduceat(mx, starts),
+        "sum": np.add.reduceat(sm, starts),
+        "count": np.add.reduceat(ct, starts),
+        "last": last[ends],
+    }, index=pd.Index(bucket[starts], name="bucket"))
+
+def rollup_levels(ts, vals):
+    """
+    Builds every level for sorted raw samples (error values already NaN);
+    each level is reduced from the previous one since the widths nest.
+    """
+    mask = np.isfinite(vals)
+    keys, vals = ts[mask], vals[mask]
+    parts = (vals, vals, vals, np.ones(len(vals), dtype=np.int64), vals)
+    levels = {}
+    for w in ROLLUP_LEVELS_MS:
+        df = rollup_reduce(keys // w * w, parts)
+        levels[w] = df
+        keys = df.index.to_numpy()
+        parts = tuple(df[f].to_numpy() for f in ROLLUP_FIELDS)
+    return levels
+
+def raw_column_values(tag, lo=0, hi=None, err=None):
+    return raw_float_values(RAW_TABLE[tag].iloc[lo:hi], err)
+
+def get_rollups(tag, err):
+    """
+    Returns the levels for tag, rebuilding them when missing or when they
+    were built with a different error value.
+    """
+    entry = ROLLUPS.get(tag)
+    if entry is None or entry["err"] != err:
+        ts = RAW_TABLE["NumericTimestamp"].to_numpy(dtype=np.int64)
+        entry = {"err": err, "levels": rollup_levels(ts, raw_column_values(tag, err=err))}
+        ROLLUPS[tag] = entry
+    return entry["levels"]
+
+def update_rollups(tags, t0, t1):
+    """
+    Re-aggregates the buckets covering raw [t0, t1] (aligned to the coarsest
+    level) for tags that already have levels.
+    """
+    tags = [t for t in tags if t in ROLLUPS]
+    if not tags:
+        return
+    w = ROLLUP_LEVELS_MS[-1]
+    b0, b1 = t0 // w * w, t1 // w * w + w
+    raw_ts = RAW_TABLE["NumericTimestamp"].to_numpy(dtype=np.int64)
+    lo = int(np.searchsorted(raw_ts, b0, side="left"))
+    hi = int(np.searchsorted(raw_ts, b1, side="left"))
+    for tag in tags:
+        entry = ROLLUPS[tag]
+        fresh = rollup_levels(raw_ts[lo:hi], raw_column_values(tag, lo, hi, entry["err"]))
+        for width, df in entry["levels"].items():
+            keys = df.index.to_numpy()
+            i = int(np.searchsorted(keys, b0, side="left"))
+            j = int(np.searchsorted(keys, b1, side="left"))
+            entry["levels"][width] = pd.concat([df.iloc[:i], fresh[width], df.iloc[j:]])
+
+def rollup_series(tag, settings, offset_ms, x_min, x_max, n_buckets):
+    """
+    Chart points for tag from the finest level with at most n_buckets buckets
+    in the working range [x_min, x_max] (None => everything): each bucket
+    gives its min and max, ordered by whether it ends above its mean.
+    Ranges too wide for the coarsest level are min/max bucketed once more.
+    Returns (timestamps, values, width_ms, samples).
+    """
+    err, sc_factor, decimals = settings
+    levels = get_rollups(tag, err)
+    for w in ROLLUP_LEVELS_MS:
+        df = levels[w]
+        keys = df.index.to_numpy()
+        i0 = 0 if x_min is None else int(np.searchsorted(keys, (x_min - offset_ms) // w * w, side="left"))
+        i1 = len(keys) if x_max is None else int(np.searchsorted(keys, x_max - offset_ms, side="right"))
+        if i1 - i0 <= n_buckets:
+            break
+    part = df.iloc[i0:i1]
+    b = part.index.to_numpy() + offset_ms
+    lo_v = part["min"].to_numpy() * sc_factor
+    hi_v = part["max"].to_numpy() * sc_factor
+    if sc_factor < 0:
+        lo_v, hi_v = hi_v, lo_v
+    rising = part["last"].to_numpy() * sc_factor >= part["sum"].to_numpy() / part["count"].to_numpy() * sc_factor
+    t = np.column_stack([b, b + w // 2]).ravel()
+    v = np.column_stack([np.where(rising, lo_v, hi_v), np.where(rising, hi_v, lo_v)]).ravel().round(decimals)
+    if x_min is not None:
+        t = np.clip(t, x_min, x_max)
+    if len(t) > 2 * n_buckets:
+        # even the coarsest level is too dense for the range
+        idx = minmax_indices(t, v, n_buckets)
+        t, v = t[idx], v[idx]
+    return t, v, w, int(part["count"].sum())
 
 ###############################################################################
-# FORWARD-FILL
+# MEMORY BUDGET (LRU eviction of (tag, day) blocks from RAW_TABLE)
 ###############################################################################
-def build_filled_df_from_raw_table():
-    global RAW_TABLE
+RAW_MEMORY_BUDGET_MB = 1024
+EVICT_BLOCK_SECONDS = 86400
+EVICT_LOW_WATER = 0.8        # evict down to this fraction of the budget
+EVICT_MIN_AGE_SECONDS = 60   # blocks used this recently are never evicted
+
+# (tag, block index) => last time the block was requested
+BLOCK_ACCESS = {}
+# (tag, block index) cleared from RAW_TABLE but still in the columnar cache
+EVICTED_BLOCKS = set()
+EVICTION_STATS = {"runs": 0, "blocks": 0, "samples": 0}
+
+def touch_blocks(tags, st, en):
+    """
+    Marks the day blocks of (st, en) (unix seconds) as used for tags.
+    """
+    now = time.time()
+    for b in range(int(st) // EVICT_BLOCK_SECONDS, int(en) // EVICT_BLOCK_SECONDS + 1):
+        for tag in tags:
+            BLOCK_ACCESS[(tag, b)] = now
+
+def raw_table_bytes():
     if RAW_TABLE is None or RAW_TABLE.empty:
-        return None
-    tgSetData = safe_load_json(get_tag_settings_path(), {
-        "scale_factors": {}, "error_value": {}, "max_decimal": {}
-    })
-    err_vals = tgSetData.get("error_value", {})
-    df_filled = RAW_TABLE.copy()
-    for c in df_filled.columns:
-        if c in ["Timestamp", "NumericTimestamp"]:
+        return 0
+    return int(RAW_TABLE.memory_usage(index=True, deep=False).sum())
+
+def resident_blocks():
+    """
+    [(tag, block, samples), ...] for every block holding RAW_TABLE values.
+    """
+    out = []
+    ts = RAW_TABLE["NumericTimestamp"].to_numpy(dtype=np.int64)
+    block_ms = EVICT_BLOCK_SECONDS * 1000
+    for tag in RAW_TABLE.columns:
+        if tag == "NumericTimestamp":
+            continue
+        valid = RAW_TABLE[tag].notna().to_numpy()
+        blocks, counts = np.unique(ts[valid] // block_ms, return_counts=True)
+        out.extend((tag, int(b), int(n)) for b, n in zip(blocks, counts))
+    return out
+
+def enforce_memory_budget():
+    """
+    Called under global_lock after RAW_TABLE grows. When it is over budget,
+    the least recently requested (tag, day) blocks are cleared from memory
+    and rows left without any value are dropped. The columnar cache keeps
+    the blocks (see reload_evicted_blocks); the json file is rewritten
+    whole, so there TAG_COVERAGE is trimmed and the ranges are fetched
+    again when next requested. No cache file is written here.
+    """
+    global RAW_TABLE, RAW_DIRTY_FROM, RAW_TABLE_SIGNATURE
+    keep_on_disk = get_raw_cache().supports_append
+    budget = int(RAW_MEMORY_BUDGET_MB * 1024 * 1024)
+    used = raw_table_bytes()
+    if budget <= 0 or used <= budget:
+        return 0
+
+    blocks = resident_blocks()
+    total = sum(n for (_, _, n) in blocks)
+    if not total:
+        return 0
+    need = total * (1.0 - (budget * EVICT_LOW_WATER) / used)
+    cutoff = time.time() - EVICT_MIN_AGE_SECONDS
+    blocks.sort(key=lambda x: BLOCK_ACCESS.get((x[0], x[1]), 0.0))
+    victims = []
+    freed = 0
+    for (tag, b, n) in blocks:
+        if freed >= need or BLOCK_ACCESS.get((tag, b), 0.0) > cutoff:
+            break
+        if keep_on_disk and tag in RAW_DIRTY_TAGS:
+            continue  # not saved yet: the cache cannot give it back
+        victims.append((tag, b))
+        freed += n
+    if not victims:
+        python_logger.warning(f"RAW_TABLE over budget ({used} > {budget} bytes) but every block is in use.")
+        return 0
+
+    ts = RAW_TABLE["NumericTimestamp"].to_numpy(dtype=np.int64)
+    block_ms = EVICT_BLOCK_SECONDS * 1000
+    for (tag, b) in victims:
+        lo = int(np.searchsorted(ts, b * block_ms, side="left"))
+        hi = int(np.searchsorted(ts, (b + 1) * block_ms, side="left"))
+        RAW_TABLE.iloc[lo:hi, RAW_TABLE.columns.get_loc(tag)] = np.nan
+        BLOCK_ACCESS.pop((tag, b), None)
+        ROLLUPS.pop(tag, None)
+        if keep_on_disk:
+            EVICTED_BLOCKS.add((tag, b))
+            continue
+        cov = TAG_COVERAGE.get(tag)
+        if cov is not None:
+            iv = (b * EVICT_BLOCK_SECONDS, (b + 1) * EVICT_BLOCK_SECONDS)
+            cov.remove(*iv)
+            append_tag_coverage(tag, iv, removed=True)
+            drop_etags(TAG_ETAGS, tag, *iv)
+        RAW_DIRTY_TAGS.add(tag)  # saved by compact_caches, outside the lock
+
+    value_cols = [c for c in RAW_TABLE.columns if c != "NumericTimestamp"]
+    keep = RAW_TABLE[value_cols].notna().any(axis=1).to_numpy()
+    RAW_TABLE = RAW_TABLE[keep].reset_index(drop=True)
+    first_ts = min(b for (_, b) in victims) * block_ms
+    RAW_DIRTY_FROM = first_ts if RAW_DIRTY_FROM is None else min(RAW_DIRTY_FROM, first_ts)
+    RAW_TABLE_SIGNATURE = get_raw_table_signature(RAW_TABLE)
+
+    EVICTION_STATS["runs"] += 1
+    EVICTION_STATS["blocks"] += len(victims)
+    EVICTION_STATS["samples"] += freed
+    python_logger.info(f"Evicted {len(victims)} blocks ({freed} samples): "
+                       f"RAW_TABLE {used} => {raw_table_bytes()} bytes (budget {budget}).")
+    return len(victims)
+
+def reload_evicted_blocks(blocks):
+    """
+    Reads the evicted ones of `blocks` [(tag, block), ...] back from the
+    columnar cache into RAW_TABLE. Called under global_lock; returns
+    whether anything was reloaded.
+    """
+    by_tag = {}
+    for (tag, b) in blocks:
+        if (tag, b) in EVICTED_BLOCKS:
+            by_tag.setdefault(tag, set()).add(b)
+    if not by_tag:
+        return False
+    cache = get_raw_cache()
+    block_ms = EVICT_BLOCK_SECONDS * 1000
+    fetched = {}
+    for tag, bs in by_tag.items():
+        EVICTED_BLOCKS.difference_update((tag, b) for b in bs)
+        try:
+            got = cache.read_tag(tag)
+        except Exception as e:
+            python_logger.error(f"Error reloading evicted blocks of {tag}: {e}")
             continue
-        vals = pd.to_numeric(df_filled[c], errors="coerce")
-        if c in err_vals:
+        if got is None:
+            continue
+        ts, vals = got
+        keep = np.isin(ts // block_ms, list(bs))
+        if keep.any():
+            col = pd.Series(vals[keep]).astype(cache.tag_dtype(tag))
+            fetched[tag] = [pd.DataFrame({"NumericTimestamp": ts[keep], tag: col.array})]
+    if not fetched:
+        return False
+    was_dirty = set(RAW_DIRTY_TAGS)
+    merge_new_data_into_raw_table(build_merge_batch(fetched))
+    # the samples came from the cache, so they need no saving
+    RAW_DIRTY_TAGS.difference_update(set(fetched) - was_dirty)
+    python_logger.info(f"Reloaded {sum(len(bs) for bs in by_tag.values())} evicted blocks from the cache.")
+    return True
+
+@app.route("/cache_status", methods=["GET", "POST"])
+def cache_status():
+    """
+    Resident RAW_TABLE size per tag and the memory budget.
+    POST {"budgetMB": n} changes the budget for this session.
+    """
+    global RAW_MEMORY_BUDGET_MB
+    with global_lock:
+        if request.method == "POST":
             try:
-                badv = float(err_vals[c])
-                vals = vals.mask(vals == badv, np.nan)
-            except:
-                pass
-        df_filled[c] = vals
-    df_filled = df_filled.ffill()
-    return df_filled
+                RAW_MEMORY_BUDGET_MB = float((request.get_json() or {})["budgetMB"])
+            except (KeyError, TypeError, ValueError):
+                return jsonify({"error": "budgetMB required"}), 400
+            enforce_memory_budget()
+        tags = {}
+        rows = 0
+        if RAW_TABLE is not None and not RAW_TABLE.empty:
+            rows = len(RAW_TABLE)
+            ts = RAW_TABLE["NumericTimestamp"].to_numpy(dtype=np.int64)
+            for tag in RAW_TABLE.columns:
+                if tag == "NumericTimestamp":
+                    continue
+                valid = RAW_TABLE[tag].notna().to_numpy()
+                n = int(valid.sum())
+                tags[tag] = {
+                    "dtype": str(RAW_TABLE[tag].dtype),
+                    "samples": n,
+                    "bytes": int(RAW_TABLE[tag].memory_usage(index=False, deep=False)),
+                    "first": int(ts[valid][0]) if n else None,
+                    "last": int(ts[valid][-1]) if n else None,
+                    "coverageIntervals": len(TAG_COVERAGE[tag]) if tag in TAG_COVERAGE else 0,
+                }
+        wt_bytes = 0 if WORKING_TABLE is None else int(WORKING_TABLE.memory_usage(index=True, deep=False).sum())
+        return jsonify({
+            "budgetBytes": int(RAW_MEMORY_BUDGET_MB * 1024 * 1024),
+            "residentBytes": raw_table_bytes(),
+            "workingTableBytes": wt_bytes,
+            "rows": rows,
+            "tags": tags,
+            "evictions": dict(EVICTION_STATS),
+            "evictedBlocks": len(EVICTED_BLOCKS),
+        })
 
 ###############################################################################
-# BUILD WORKING TABLE
+# TAG SETTINGS (in-memory copy of TagSettings.json)
 ###############################################################################
-def build_working_table(offset_hours=0, forward_fill=False):
-    global WORKING_TABLE, LAST_SETTINGS, RAW_TABLE
-    if RAW_TABLE is None or RAW_TABLE.empty:
-        WORKING_TABLE = None
-        return
+def get_tag_settings():
+    global TAG_SETTINGS
+    if TAG_SETTINGS is None:
+        TAG_SETTINGS = safe_load_json(get_tag_settings_path(), {
+            "scale_factors": {}, "error_value": {}, "max_decimal": {}
+        })
+    return TAG_SETTINGS
+
+def column_settings(tgSetData, c):
+    """
+    Returns the (error_value, scale_factor, decimals) tuple applied to column c.
+    """
+    err = None
+    if c in tgSetData.get("error_value", {}):
+        try:
+            err = float(tgSetData["error_value"][c])
+        except:
+            pass
+    sc_factor = float(tgSetData.get("scale_factors", {}).get(c, 1))
+    decimals = int(tgSetData.get("max_decimal", {}).get(c, 2))
+    return (err, sc_factor, decimals)
 
-    tgSetData = safe_load_json(get_tag_settings_path(), {
-        "scale_factors": {}, "error_value": {}, "max_decimal": {}
-    })
-    err_vals = tgSetData.get("error_value", {})
+###############################################################################
+# BUILD WORKING TABLE
+###############################################################################
+def transform_column(vals, settings):
+    """
+    Error-value mask, scale factor and rounding for one RAW_TABLE column
+    (of any RAW_TABLE dtype); the working values are float64.
+    """
+    err, sc_factor, decimals = settings
+    vals = pd.Series(raw_float_values(vals, err), index=vals.index)
+    return (vals * sc_factor).round(decimals)
 
+def build_working_rows(raw_slice, cols, settings, offset_ms, forward_fill, seed=None):
+    """
+    Builds WORKING_TABLE rows for a slice of RAW_TABLE. With forward_fill,
+    `seed` (the previous working row) carries the last valid values forward.
+    Scaling/rounding are per-element so filling after them is equivalent to
+    filling the masked raw values first.
+    """
+    out = {"NumericTimestamp": raw_slice["NumericTimestamp"].to_numpy(dtype=np.int64) + offset_ms}
+    for c in cols:
+        out[c] = transform_column(raw_slice[c], settings[c]).to_numpy()
+    wdf = pd.DataFrame(out)
     if forward_fill:
-        base_df = build_filled_df_from_raw_table()
-    else:
-        base_df = RAW_TABLE.copy()
-        for c in base_df.columns:
-            if c in ["Timestamp", "NumericTimestamp"]:
-                continue
-            vals = pd.to_numeric(base_df[c], errors="coerce")
-            if c in err_vals:
-                try:
-                    badv = float(err_vals[c])
-                    vals = vals.mask(vals == badv, np.nan)
-                except:
-                    pass
-            base_df[c] = vals
+        if seed is not None:
+            wdf = pd.concat([seed, wdf], ignore_index=True).ffill().iloc[1:].reset_index(drop=True)
+        else:
+            wdf = wdf.ffill()
+    return wdf
+
+def selected_columns(tags):
+    """
+    RAW_TABLE columns shown in WORKING_TABLE: the selected tags that are
+    cached (in RAW_TABLE order), or every column when tags is None.
+    """
+    sel = None if tags is None else set(tags)
+    return [c for c in RAW_TABLE.columns if c != "NumericTimestamp" and (sel is None or c in sel)]
+
+def selected_rows(raw_slice, cols):
+    """
+    Rows of a RAW_TABLE slice where at least one selected tag has a value;
+    rows that only carry deselected tags stay out of WORKING_TABLE.
+    """
+    if not cols:
+        return raw_slice.iloc[:0]
+    mask = raw_slice[cols].notna().to_numpy().any(axis=1)
+    return raw_slice if mask.all() else raw_slice[mask]
 
-    if base_df is None or base_df.empty:
+def build_working_table(offset_hours=0, forward_fill=False, tags=None):
+    """
+    Full WORKING_TABLE rebuild from RAW_TABLE, projected on `tags`.
+    """
+    global WORKING_TABLE, RAW_TABLE, RAW_DIRTY_FROM, WT_STATE
+    RAW_DIRTY_FROM = None
+    if RAW_TABLE is None or RAW_TABLE.empty:
         WORKING_TABLE = None
+        WT_STATE = None
         return
 
+    tgSetData = get_tag_settings()
+    cols = selected_columns(tags)
+    settings = {c: column_settings(tgSetData, c) for c in cols}
     offMs = int(offset_hours * 3600000)
-    wdf = base_df.copy()
-    wdf["NumericTimestamp"] = wdf["NumericTimestamp"] + offMs
-    wdf["Timestamp"] = wdf["NumericTimestamp"].apply(
-        lambda x: fmt_timestamp(pd.to_datetime(x, unit="ms"))
-    )
+    WORKING_TABLE = build_working_rows(selected_rows(RAW_TABLE, cols), cols, settings, offMs, forward_fill)
+    WT_STATE = {"offset_ms": offMs, "forward_fill": forward_fill, "settings": settings,
+                "tags": None if tags is None else list(tags), "columns": cols, "raw_rows": len(RAW_TABLE)}
 
-    sf = tgSetData.get("scale_factors", {})
-    dec = tgSetData.get("max_decimal", {})
+def update_working_table(offset_hours=0, forward_fill=False, tags=None):
+    """
+    Brings WORKING_TABLE up to date with RAW_TABLE, the current settings and
+    the selected tags, touching as little as possible:
+      - rows from RAW_DIRTY_FROM onward are rebuilt (seeded for ffill),
+      - columns whose tag settings changed are rebuilt,
+      - an offset change only shifts NumericTimestamp.
+    Falls back to a full rebuild when the forward-fill mode or the set of
+    shown columns changed, or the tables are out of step. Selecting or
+    deselecting a cached tag is therefore a rebuild from memory, no fetch.
+    Returns (changed, everything_changed, from_ts) where from_ts is the
+    first working NumericTimestamp that was rebuilt when only the tail
+    changed.
+    """
+    global WORKING_TABLE, RAW_TABLE, RAW_DIRTY_FROM, WT_STATE
+    if RAW_TABLE is None or RAW_TABLE.empty:
+        changed = WORKING_TABLE is not None
+        build_working_table(offset_hours, forward_fill, tags)
+        return changed, True, None
 
-    for c in wdf.columns:
-        if c in ["Timestamp", "NumericTimestamp"]:
-            continue
-        vals = pd.to_numeric(wdf[c], errors="coerce")
-        sc_factor = float(sf.get(c, 1))
-        decimals = int(dec.get(c, 2))
-        vals = (vals * sc_factor).round(decimals)
-        wdf[c] = vals
+    offMs = int(offset_hours * 3600000)
+    cols = selected_columns(tags)
+    raw_ts = RAW_TABLE["NumericTimestamp"].to_numpy()
+    if (WORKING_TABLE is None or WT_STATE is None or WT_STATE["forward_fill"] != forward_fill
+            or WT_STATE["columns"] != cols
+            or (RAW_DIRTY_FROM is None and WT_STATE["raw_rows"] != len(raw_ts))):
+        build_working_table(offset_hours, forward_fill, tags)
+        return True, True, None
+
+    # WORKING_TABLE rows are a subset of RAW_TABLE rows, so both tables are
+    # split at the first dirty raw timestamp
+    wt_raw_ts = WORKING_TABLE["NumericTimestamp"].to_numpy() - WT_STATE["offset_ms"]
+    if RAW_DIRTY_FROM is None:
+        p, q = len(wt_raw_ts), len(raw_ts)
+    else:
+        p = int(np.searchsorted(wt_raw_ts, RAW_DIRTY_FROM, side="left"))
+        q = int(np.searchsorted(raw_ts, RAW_DIRTY_FROM, side="left"))
+
+    tgSetData = get_tag_settings()
+    settings = {c: column_settings(tgSetData, c) for c in cols}
+    changed = False
+    everything = False
+
+    head = WORKING_TABLE.iloc[:p]
+    if WT_STATE["offset_ms"] != offMs:
+        head = head.assign(NumericTimestamp=head["NumericTimestamp"] + (offMs - WT_STATE["offset_ms"]))
+        changed = everything = True
+
+    # Only columns whose own settings changed are recomputed over history
+    stale = [c for c in cols if WT_STATE["settings"].get(c) != settings[c]]
+    if stale:
+        head = head.copy()
+        rows = np.searchsorted(raw_ts, wt_raw_ts[:p], side="left")
+        for c in stale:
+            vals = transform_column(RAW_TABLE[c].iloc[rows], settings[c])
+            head[c] = (vals.ffill() if forward_fill else vals).to_numpy()
+        changed = everything = True
+
+    tail_raw = selected_rows(RAW_TABLE.iloc[q:], cols) if q < len(raw_ts) else None
+    if tail_raw is not None and len(tail_raw):
+        seed = head.iloc[[p - 1]] if (forward_fill and p > 0) else None
+        tail = build_working_rows(tail_raw, cols, settings, offMs, forward_fill, seed=seed)
+        head = pd.concat([head, tail], ignore_index=True)
+        changed = True
+    elif p < len(wt_raw_ts):
+        changed = True  # rows past RAW_DIRTY_FROM went away (eviction)
+
+    WORKING_TABLE = head
+    WT_STATE = {"offset_ms": offMs, "forward_fill": forward_fill, "settings": settings,
+                "tags": None if tags is None else list(tags), "columns": cols, "raw_rows": len(raw_ts)}
+    RAW_DIRTY_FROM = None
+    from_ts = int(raw_ts[q]) + offMs if changed and not everything and q < len(raw_ts) else None
+    if changed and not everything and from_ts is None:
+        everything = True
+    return changed, everything, from_ts
 
-    WORKING_TABLE = wdf.copy()
+###############################################################################
+# WORKING_TABLE VERSIONS (delta responses)
+###############################################################################
+def working_table_token():
+    return f"{WT_EPOCH}:{WT_VERSION}"
+
+def record_working_table_change(everything, from_ts):
+    global WT_VERSION
+    WT_VERSION += 1
+    WT_HISTORY.append((WT_VERSION, None if everything else from_ts))
+
+def working_table_delta_start(token):
+    """
+    Given a client's version token, returns ("none", None) if it is current,
+    ("delta", ts) if only rows from working NumericTimestamp ts onward
+    changed since, or ("full", None) if the client needs the whole table.
+    """
+    if not token or not isinstance(token, str) or ":" not in token:
+        return "full", None
+    epoch, _, ver = token.partition(":")
+    try:
+        ver = int(ver)
+    except ValueError:
+        return "full", None
+    if epoch != WT_EPOCH or ver > WT_VERSION:
+        return "full", None
+    if ver == WT_VERSION:
+        return "none", None
+    newer = [h for h in WT_HISTORY if h[0] > ver]
+    if len(newer) != WT_VERSION - ver or any(h[1] is None for h in newer):
+        return "full", None  # history too short or a full change happened
+    return "delta", min(h[1] for h in newer)
 
 ###############################################################################
 # PARTIAL FETCH => RAW_TABLE
@@ -507,8 +2185,11 @@ def fetch_data_endpoint():
     Fetch new data only for time intervals not yet covered by TAG_COVERAGE.
     Merge into RAW_TABLE if new data is received.
     Return { newData: true/false, redrawNeeded: true/false } accordingly.
+    With "async": true the fetch runs as a FetchJob and { jobId } is
+    returned immediately (see /fetch_status, /fetch_events, /fetch_cancel).
+    With "revalidate": true the covered intervals are re-requested too,
+    conditionally where the historian gave an ETag.
     """
-    global RAW_TABLE, TAG_COVERAGE, RAW_TABLE_SIGNATURE
     req = request.get_json()
     if not req:
         return jsonify({"error": "Invalid JSON"}), 400
@@ -517,139 +2198,849 @@ def fetch_data_endpoint():
     st = req.get("startDateUnixSeconds")
     en = req.get("endDateUnixSeconds")
     autoRefresh = bool(req.get("autoRefresh", False))
-    user_logger.info(f"/fetch_data with tags={tags}, st={st}, en={en}, autoRefresh={autoRefresh}")
+    run_async = bool(req.get("async", False))
+    revalidate = bool(req.get("revalidate", False))
+    user_logger.info(f"/fetch_data with tags={tags}, st={st}, en={en}, autoRefresh={autoRefresh}, "
+                     f"async={run_async}, revalidate={revalidate}")
     if not tags or st is None or en is None:
         return jsonify({"error": "Missing fields"}), 400
 
-    data_changed = False
-    old_signature = RAW_TABLE_SIGNATURE
-
-    with global_lock:
-        # Drop any removed tags from coverage
-        old_tags = set(TAG_COVERAGE.keys())
-        new_tags = set(tags)
-        removed = old_tags - new_tags
-        for rt in removed:
-            remove_tag_coverage(rt)
+    if run_async:
+        job = start_fetch_job(tags, st, en, revalidate)
+        return jsonify({"status": "accepted", "jobId": job.id}), 202
 
-        if RAW_TABLE is None:
-            RAW_TABLE = pd.DataFrame(columns=["NumericTimestamp","Timestamp"])
+    data_changed = run_fetch(tags, st, en, revalidate=revalidate)
+    # If data didn't change, no need to rebuild on front end
+    return jsonify({"status": "ok", "newData": data_changed, "redrawNeeded": data_changed})
 
-        futs = []
-        executor_size = min(len(tags), 4)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=executor_size) as exe:
-            for tg in tags:
-                if tg not in TAG_COVERAGE:
-                    TAG_COVERAGE[tg] = []
-
-                coverage_list = union_intervals(TAG_COVERAGE[tg])
-                needed = (st, en)
-                missing = []
-                cS = needed[0]
-                cE = needed[1]
-
-                # Figure out sub-intervals not covered
-                for (cvS, cvE) in coverage_list:
-                    # if coverage doesn't overlap
-                    if cvE < cS or cvS > cE:
-                        continue
-                    # partial coverage
-                    if cvS > cS:
-                        missing.append((cS, min(cvS, cE)))
-                    if cvE > cS:
-                        cS = max(cS, cvE)
-                    if cS > cE:
-                        break
-
-                if cS < cE:
-                    missing.append((cS, cE))
-
-                # Submit fetch tasks for missing intervals
-                for (miS, miE) in missing:
-                    if miE <= miS:
-                        continue
-                    fut = exe.submit(fetch_values, tg, miS, miE)
-                    futs.append((fut, tg, miS, miE))
+def run_fetch(tags, st, en, job=None, revalidate=False):
+    """
+    global_lock is only held to plan the missing intervals and to commit the
+    results; the historian calls run in FETCH_EXECUTOR without it. Missing
+    intervals are fetched in FETCH_CHUNK_SECONDS chunks and coverage is
+    recorded per committed chunk, so a failed long fetch keeps its progress.
+
+    With a FetchJob, progress is reported per chunk, a tag is committed as
+    soon as all its chunks are in, and cancelling stops after committing what
+    has arrived. Tags that are not in `tags` stay cached (deselecting a tag
+    is a view change, see /build_working_table); only enforce_memory_budget
+    evicts data.
+
+    With revalidate, covered chunks of (st, en) are fetched again as well,
+    sending their stored ETag: unchanged chunks cost one 304 (or a
+    "notModified" batch entry), changed ones replace the cached samples.
+
+    Coverage stops HISTORIAN_LAG_SECONDS before now, so the recent tail is
+    fetched again next time and samples written late are picked up.
+    Returns whether RAW_TABLE changed.
+    """
+    global RAW_TABLE, TAG_COVERAGE
+    cover_until = int(time.time()) - HISTORIAN_LAG_SECONDS
 
-        # Process fetch results
-        for (fut, tg, fs, fe) in futs:
+    # 1) Plan (short lock)
+    missing_by_range = {}
+    refresh = {}  # (tag, st, en) => etag or None for covered chunks fetched again
+    with global_lock:
+        if RAW_TABLE is None:
+            RAW_TABLE = pd.DataFrame(columns=["NumericTimestamp"])
+        reloaded = ensure_tags_resident(tags, st, en)
+        touch_blocks(tags, st, en)
+
+        for tg in tags:
+            if tg not in TAG_COVERAGE:
+                TAG_COVERAGE[tg] = CoverageIndex()
+            for (miS, miE) in TAG_COVERAGE[tg].gaps(st, en):
+                for iv in split_interval(miS, miE):
+                    missing_by_range.setdefault(iv, []).append(tg)
+            if revalidate:
+                for iv, etag in revalidation_chunks(tg, st, en):
+                    missing_by_range.setdefault(iv, []).append(tg)
+                    refresh[(tg,) + iv] = etag
+        epoch = WT_EPOCH
+    futs = submit_fetches(missing_by_range, refresh)
+    if not futs:
+        return reloaded
+
+    meta = {fut: (tg, fs, fe) for (fut, tg, fs, fe) in futs}
+    left = {}
+    for (tg, fs, fe) in meta.values():
+        left[tg] = left.get(tg, 0) + 1
+    if job is not None:
+        job.plan(left)
+
+    # 2) Network I/O and parsing with no lock held; parsed chunks are
+    #    committed in groups of about FETCH_COMMIT_ROWS rows
+    data_changed = reloaded
+    pending = []
+    pending_rows = 0
+    parsed_rows, parse_secs = 0, 0.0
+    not_modified = 0
+    remaining = set(meta)
+    while remaining and not (job is not None and job.cancelled):
+        done, remaining = concurrent.futures.wait(
+            remaining, timeout=0.5, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        tag_completed = False
+        for fut in done:
+            tg, fs, fe = meta[fut]
+            left[tg] -= 1
+            tag_completed |= left[tg] == 0
+            df_ren = None
+            answered = False  # the historian answered, even if with no samples
+            etag = None
             try:
                 tagFetched, arr = fut.result()
-                if arr:
-                    df = pd.DataFrame(arr)
+                if isinstance(arr, dict):
+                    answered = True
+                    etag = arr.get("etag")
+                    if arr.get("notModified"):
+                        not_modified += 1
+                        answered = False
+                if answered:
+                    t0 = time.perf_counter()
+                    df_ren = parse_values(tg, arr)
+                    parse_secs += time.perf_counter() - t0
+                    parsed_rows += 0 if df_ren is None else len(df_ren)
+            except Exception as e:
+                python_logger.error(f"Error partial fetching {tg} {fs}..{fe} => {e}")
+            if job is not None:
+                job.chunk_done(tg, 0 if df_ren is None else len(df_ren))
+            is_refresh = (tg, fs, fe) in refresh
+            if df_ren is not None or (answered and is_refresh):
+                pending.append((tg, fs, fe, df_ren, etag, is_refresh))
+                pending_rows += 0 if df_ren is None else len(df_ren)
+        if pending and (pending_rows >= FETCH_COMMIT_ROWS or (job is not None and tag_completed)):
+            changed = commit_fetch_results(pending, epoch, cover_until)
+            if changed is None:
+                pending = []
+                break
+            data_changed |= changed
+            if job is not None:
+                job.committed(changed)
+            pending, pending_rows = [], 0
+    if pending:
+        changed = commit_fetch_results(pending, epoch, cover_until)
+        data_changed |= bool(changed)
+        if job is not None and changed is not None:
+            job.committed(changed)
+    if parsed_rows and parse_secs > 0:
+        python_logger.info(f"Parsed {parsed_rows} rows in {parse_secs:.3f}s ({parsed_rows / parse_secs:.0f} rows/s)")
+    if refresh:
+        python_logger.info(f"Revalidated {len(refresh)} cached chunks: {not_modified} not modified.")
+    HISTORIAN.log_stats()
+    return data_changed
+
+def raw_range_equals(tag, t0, t1, df):
+    """
+    Whether RAW_TABLE holds exactly df's samples for tag with t0 <= NumericTimestamp <= t1.
+    """
+    ts = RAW_TABLE["NumericTimestamp"].to_numpy()
+    lo = int(np.searchsorted(ts, t0, side="left"))
+    hi = int(np.searchsorted(ts, t1, side="right"))
+    old = raw_float_values(RAW_TABLE[tag].iloc[lo:hi]) if tag in RAW_TABLE.columns else np.empty(0)
+    valid = ~np.isnan(old)
+    if df is None:
+        return not valid.any()
+    new = raw_float_values(df[tag])
+    new_valid = ~np.isnan(new)
+    return (np.array_equal(ts[lo:hi][valid], df["NumericTimestamp"].to_numpy()[new_valid])
+            and np.array_equal(old[valid], new[new_valid]))
+
+def raw_range_resident(tag, t0, t1):
+    """
+    Whether RAW_TABLE holds any value of tag with t0 <= NumericTimestamp <= t1 (ms).
+    """
+    if RAW_TABLE is None or tag not in RAW_TABLE.columns:
+        return False
+    ts = RAW_TABLE["NumericTimestamp"].to_numpy()
+    lo = int(np.searchsorted(ts, t0, side="left"))
+    hi = int(np.searchsorted(ts, t1, side="right"))
+    return hi > lo and bool(RAW_TABLE[tag].iloc[lo:hi].notna().any())
+
+def clear_raw_range(tag, t0, t1):
+    """
+    Clears tag's RAW_TABLE values with t0 <= NumericTimestamp <= t1 (ms),
+    drops rows left without any value and marks the tag for a full save.
+    """
+    global RAW_TABLE, RAW_DIRTY_FROM
+    if RAW_TABLE is None or tag not in RAW_TABLE.columns:
+        return
+    ts = RAW_TABLE["NumericTimestamp"].to_numpy()
+    lo = int(np.searchsorted(ts, t0, side="left"))
+    hi = int(np.searchsorted(ts, t1, side="right"))
+    if hi > lo:
+        RAW_TABLE.iloc[lo:hi, RAW_TABLE.columns.get_loc(tag)] = np.nan
+        value_cols = [c for c in RAW_TABLE.columns if c != "NumericTimestamp"]
+        keep = np.ones(len(RAW_TABLE), dtype=bool)
+        keep[lo:hi] = RAW_TABLE[value_cols].iloc[lo:hi].notna().any(axis=1).to_numpy()
+        if not keep.all():
+            RAW_TABLE = RAW_TABLE[keep].reset_index(drop=True)
+    RAW_DIRTY_FROM = t0 if RAW_DIRTY_FROM is None else min(RAW_DIRTY_FROM, t0)
+    RAW_DIRTY_TAGS.add(tag)
+    ROLLUPS.pop(tag, None)
+
+def commit_fetch_results(results, epoch, cover_until=None):
+    """
+    Merges parsed chunks [(tag, st, en, df, etag, refresh), ...] into
+    RAW_TABLE and records their coverage and ETag under a short global_lock.
+    A refresh chunk that is still covered replaces the cached samples of
+    (st, en) when they differ. Coverage is recorded up to `cover_until`
+    (unix seconds) only; a chunk fetched again over samples it already has
+    merges nothing. Returns whether RAW_TABLE changed, or None when the
+    cache was cleared since `epoch`.
+    """
+    global RAW_TABLE_SIGNATURE, TAG_COVERAGE
+    with global_lock:
+        if WT_EPOCH != epoch:
+            return None
+
+        # Skip tags evicted/cleared meanwhile and intervals another request already committed
+        fetched = {}
+        covered = []
+        replaced = set()
+        for (tg, fs, fe, df_ren, etag, refresh) in results:
+            if tg not in TAG_COVERAGE:
+                continue
+            if not TAG_COVERAGE[tg].gaps(fs, fe):
+                if not refresh:
+                    continue
+                # the historian sends every sample of seconds fs..fe
+                t0, t1 = fs * 1000, fe * 1000 + 999
+                if raw_range_equals(tg, t0, t1, df_ren):
+                    df_ren = None
                 else:
-                    df = pd.DataFrame(columns=["Date", "Value"])
-                if df.empty:
+                    clear_raw_range(tg, t0, t1)
+                    replaced.add(tg)
+            elif df_ren is not None and raw_range_resident(tg, fs * 1000, fe * 1000 + 999):
+                # the uncovered recent tail, fetched again
+                if raw_range_equals(tg, fs * 1000, fe * 1000 + 999, df_ren):
+                    df_ren = None
+            if df_ren is not None:
+                fetched.setdefault(tg, []).append(df_ren)
+            if cover_until is not None and fe > cover_until:
+                if fs > cover_until:
                     continue
+                fe, etag = cover_until, None  # the ETag is for the whole chunk
+            covered.append((tg, fs, fe, etag))
 
-                df["Value"] = pd.to_numeric(df["Value"], errors="coerce")
-                df.replace([np.inf, -np.inf], np.nan, inplace=True)
-                df["Timestamp"] = pd.to_datetime(df["Date"], errors="coerce")
-                # NumericTimestamp in ms
-                df["NumericTimestamp"] = (df["Timestamp"].astype(np.int64) // 1_000_000)
-                df.sort_values("Timestamp", inplace=True)
-                df_ren = df[["NumericTimestamp", "Timestamp", "Value"]].rename(columns={"Value": tg})
-
-                merge_new_data_into_raw_table(df_ren)
-                TAG_COVERAGE[tg].append((fs, fe))
-                TAG_COVERAGE[tg] = union_intervals(TAG_COVERAGE[tg])
+        deltas = {}
+        was_dirty = set(RAW_DIRTY_TAGS)
 
+        # One sorted merge per commit
+        if fetched:
+            try:
+                merge_new_data_into_raw_table(build_merge_batch(fetched))
             except Exception as e:
-                python_logger.error(f"Error partial fetching {tg} {fs}..{fe} => {e}")
-
-        # Compare new signature to see if RAW_TABLE changed
-        new_signature = get_raw_table_signature(RAW_TABLE)
-        data_changed = (new_signature != old_signature)
+                python_logger.error(f"Error merging fetched data => {e}")
+                fetched, covered = {}, []
+
+        for tg, parts in fetched.items():
+            if tg in replaced:
+                continue  # samples were removed: the full save rewrites the tag
+            for df_ren in parts:
+                vals = raw_float_values(df_ren[tg])
+                valid = ~np.isnan(vals)
+                if valid.any():
+                    deltas.setdefault(tg, []).append((df_ren["NumericTimestamp"].to_numpy()[valid], vals[valid]))
+            if tg not in deltas and tg not in was_dirty:
+                RAW_DIRTY_TAGS.discard(tg)  # no samples: the merge changed nothing
+        for (tg, fs, fe, etag) in covered:
+            TAG_COVERAGE[tg].add(fs, fe)
+            append_tag_coverage(tg, (fs, fe), etag=etag)
+            if etag:
+                record_etag(TAG_ETAGS, tg, (fs, fe), etag)
+
+        # Samples merged into rows that already existed (another tag's
+        # timestamps) leave the signature alone, so decide from what merged
+        data_changed = bool(deltas) or bool(replaced)
         if data_changed:
-            RAW_TABLE_SIGNATURE = new_signature
-            save_raw_table_cache()
-            save_tag_coverage()
+            RAW_TABLE_SIGNATURE = get_raw_table_signature(RAW_TABLE)
+            # O(new rows): append logs only, compaction rewrites the main cache
+            persist_raw_table_changes(deltas)
+            enforce_memory_budget()
+        return data_changed
 
-    # If data didn't change, no need to rebuild on front end
-    return jsonify({"status": "ok", "newData": data_changed, "redrawNeeded": data_changed})
+###############################################################################
+# ASYNC FETCH JOBS
+###############################################################################
+FETCH_JOB_TTL_SECONDS = 600
+FETCH_JOBS = {}
+FETCH_JOBS_LOCK = Lock()
+
+class FetchJob:
+    """
+    State of one asynchronous /fetch_data run. Every change bumps `seq` and
+    wakes /fetch_events listeners.
+    """
+    def __init__(self, tags, st, en, revalidate=False):
+        self.id = os.urandom(8).hex()
+        self.tags = list(tags)
+        self.st = st
+        self.en = en
+        self.revalidate = revalidate
+        self.status = "running"
+        self.error = None
+        self.started = time.time()
+        self.finished = None
+        self.progress = {tg: {"chunks": 0, "done": 0, "rows": 0} for tg in self.tags}
+        self.rows = 0
+        self.commits = 0
+        self.new_data = False
+        self.cancelled = False
+        self.seq = 0
+        self.cond = threading.Condition()
+
+    def _changed(self):
+        self.seq += 1
+        self.cond.notify_all()
+
+    def plan(self, chunks_by_tag):
+        with self.cond:
+            for tg, n in chunks_by_tag.items():
+                self.progress.setdefault(tg, {"chunks": 0, "done": 0, "rows": 0})["chunks"] = n
+            self._changed()
+
+    def chunk_done(self, tag, rows):
+        with self.cond:
+            p = self.progress[tag]
+            p["done"] += 1
+            p["rows"] += rows
+            self.rows += rows
+            self._changed()
+
+    def committed(self, changed):
+        with self.cond:
+            self.commits += 1
+            self.new_data |= bool(changed)
+            self._changed()
+
+    def cancel(self):
+        with self.cond:
+            self.cancelled = True
+            self._changed()
+
+    def finish(self, status, error=None):
+        with self.cond:
+            self.status = status
+            self.error = error
+            self.finished = time.time()
+            self._changed()
+
+    def snapshot(self):
+        with self.cond:
+            elapsed = (self.finished or time.time()) - self.started
+            return {
+                "jobId": self.id,
+                "status": self.status,
+                "error": self.error,
+                "tags": {tg: dict(p) for tg, p in self.progress.items()},
+                "tagsDone": sum(1 for p in self.progress.values() if p["done"] >= p["chunks"]),
+                "rowsFetched": self.rows,
+                "elapsed": round(elapsed, 3),
+                "rowsPerSecond": round(self.rows / elapsed, 1) if elapsed > 0 else 0.0,
+                "commits": self.commits,
+                "newData": self.new_data,
+                "redrawNeeded": self.new_data,
+                "seq": self.seq,
+            }
+
+    def wait_change(self, seq, timeout):
+        """
+        Blocks until seq moves past `seq` (or timeout); returns the new seq.
+        """
+        with self.cond:
+            self.cond.wait_for(lambda: self.seq != seq, timeout=timeout)
+            return self.seq
+
+def start_fetch_job(tags, st, en, revalidate=False):
+    job = FetchJob(tags, st, en, revalidate)
+    now = time.time()
+    with FETCH_JOBS_LOCK:
+        for jid in [j for j, old in FETCH_JOBS.items() if old.finished and now - old.finished > FETCH_JOB_TTL_SECONDS]:
+            del FETCH_JOBS[jid]
+        FETCH_JOBS[job.id] = job
+    threading.Thread(target=run_fetch_job, args=(job,), daemon=True).start()
+    return job
+
+def run_fetch_job(job):
+    try:
+        run_fetch(job.tags, job.st, job.en, job, job.revalidate)
+        job.finish("cancelled" if job.cancelled else "done")
+    except Exception as e:
+        python_logger.error(f"Fetch job {job.id} failed => {e}")
+        job.finish("error", str(e))
+    user_logger.info(f"Fetch job {job.id} {job.status}: {job.rows} rows")
+
+def get_fetch_job(job_id):
+    with FETCH_JOBS_LOCK:
+        return FETCH_JOBS.get(job_id)
+
+@app.route("/fetch_status/<job_id>")
+def fetch_status(job_id):
+    job = get_fetch_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify(job.snapshot())
+
+@app.route("/fetch_events/<job_id>")
+def fetch_events(job_id):
+    """
+    Server-Sent Events stream of job snapshots until the job finishes.
+    """
+    job = get_fetch_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+
+    def stream():
+        seq = None
+        while True:
+            new_seq = job.wait_change(seq, timeout=15)
+            if new_seq == seq:
+                yield ": keepalive\n\n"
+                continue
+            seq = new_seq
+            snap = job.snapshot()
+            yield f"data: {json.dumps(snap)}\n\n"
+            if snap["status"] != "running":
+                return
+
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route("/fetch_cancel/<job_id>", methods=["POST"])
+def fetch_cancel(job_id):
+    job = get_fetch_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job"}), 404
+    job.cancel()
+    user_logger.info(f"Fetch job {job_id} cancelled by user")
+    return jsonify(job.snapshot())
+
+###############################################################################
+# LIVE TAIL (one historian poll per interval, pushed to subscribers over SSE)
+###############################################################################
+LIVE_MIN_INTERVAL_SECONDS = 1.0
+LIVE_QUEUE_SIZE = 64
+LIVE_SUBSCRIBERS = {}
+LIVE_LOCK = Lock()
+LIVE_WAKE = threading.Event()
+
+class LiveSubscriber:
+    """
+    One /live stream: its tags, poll interval and the events waiting to be sent.
+    """
+    def __init__(self, tags, interval, since):
+        self.id = os.urandom(8).hex()
+        self.tags = set(tags)
+        self.interval = max(LIVE_MIN_INTERVAL_SECONDS, interval)
+        self.since = since
+        self.events = queue.Queue(maxsize=LIVE_QUEUE_SIZE)
+
+    def push(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            # too far behind: drop the backlog and make the tab resync
+            with self.events.mutex:
+                self.events.queue.clear()
+            self.events.put_nowait({"type": "refresh"})
+
+def live_subscribe(tags, interval, since):
+    sub = LiveSubscriber(tags, interval, since)
+    with LIVE_LOCK:
+        LIVE_SUBSCRIBERS[sub.id] = sub
+    LIVE_WAKE.set()
+    python_logger.info(f"Live subscriber {sub.id} added ({len(sub.tags)} tags, {sub.interval}s)")
+    return sub
+
+def live_unsubscribe(sub):
+    with LIVE_LOCK:
+        LIVE_SUBSCRIBERS.pop(sub.id, None)
+    python_logger.info(f"Live subscriber {sub.id} removed")
+
+def live_working_table_events(subs):
+    """
+    Brings WORKING_TABLE up to date (with the settings it was last built
+    with) and returns {subscriber id: event}. Subscribers whose tags are the
+    ones WORKING_TABLE shows get a delta header (versions, first changed
+    row, row count) against the previous version; the others, and every
+    subscriber after a full rebuild, get a refresh request so their tab
+    rebuilds its own selection.
+    """
+    with global_lock:
+        if WT_STATE is None or WORKING_TABLE is None:
+            return {sub.id: {"type": "refresh"} for sub in subs}
+        base = working_table_token()
+        changed, everything, from_ts = update_working_table(
+            offset_hours=WT_STATE["offset_ms"] / 3600000, forward_fill=WT_STATE["forward_fill"],
+            tags=WT_STATE["tags"]
+        )
+        if changed:
+            record_working_table_change(everything, from_ts)
+        token = working_table_token()
+        total = int(len(WORKING_TABLE))
+        shown = {sub.id: selected_columns(sub.tags) == WT_STATE["columns"] for sub in subs}
+    events = {}
+    for sub in subs:
+        if not shown[sub.id]:
+            events[sub.id] = {"type": "refresh", "version": token}
+        elif not changed:
+            continue
+        elif everything or from_ts is None:
+            events[sub.id] = {"type": "refresh", "version": token}
+        else:
+            events[sub.id] = {"type": "delta", "base": base, "version": token, "from": from_ts,
+                              "total": total, "redrawNeeded": True}
+    return events
+
+def live_tail_worker():
+    """
+    Polls the historian once per tick for the union of subscribed tags
+    (the shortest subscriber interval wins) and pushes what changed.
+    """
+    while True:
+        with LIVE_LOCK:
+            subs = list(LIVE_SUBSCRIBERS.values())
+        if not subs:
+            LIVE_WAKE.wait()
+            LIVE_WAKE.clear()
+            continue
+        interval = min(sub.interval for sub in subs)
+        tick_start = time.time()
+        tags = sorted(set().union(*(sub.tags for sub in subs)))
+        now = int(tick_start)
+        since = min(sub.since for sub in subs)
+        try:
+            if tags and since < now and run_fetch(tags, since, now):
+                events = live_working_table_events(subs)
+                for sub in subs:
+                    if sub.id in events:
+                        sub.push(events[sub.id])
+            for sub in subs:
+                # the last HISTORIAN_LAG_SECONDS stay uncovered and are polled again
+                sub.since = max(sub.since, now - HISTORIAN_LAG_SECONDS - int(interval) - 1)
+        except Exception as e:
+            python_logger.error(f"Live tail tick failed: {e}")
+        LIVE_WAKE.wait(max(0.0, interval - (time.time() - tick_start)))
+        LIVE_WAKE.clear()
+
+@app.route("/live")
+def live_stream():
+    """
+    Server-Sent Events: ?tag=...&tag=...&interval=<ms>&since=<unix s>.
+    Sends {"type": "delta", ...} when WORKING_TABLE rows were appended, or
+    {"type": "refresh"} when the tab should call /build_working_table.
+    """
+    tags = request.args.getlist("tag")
+    if not tags:
+        return jsonify({"error": "No tags"}), 400
+    try:
+        interval = float(request.args.get("interval", 5000)) / 1000.0
+        since = int(float(request.args.get("since", time.time())))
+    except ValueError:
+        return jsonify({"error": "Invalid interval/since"}), 400
+    sub = live_subscribe(tags, interval, since)
+
+    def stream():
+        try:
+            yield f"event: hello\ndata: {json.dumps({'id': sub.id})}\n\n"
+            while True:
+                try:
+                    event = sub.events.get(timeout=15)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            live_unsubscribe(sub)
+
+    return Response(stream(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+###############################################################################
+# WIRE FORMATS (rows / columnar JSON / binary)
+###############################################################################
+COLUMNAR_MIMETYPE = "application/vnd.detool.columnar+json"
+
+def negotiate_wire_format(req):
+    """
+    Picks the response layout from the request's "format" field, falling
+    back to the Accept header; row records stay the default.
+    """
+    fmt = str((req or {}).get("format") or "").lower()
+    if fmt in ("rows", "columnar", "binary"):
+        return fmt
+    accept = request.headers.get("Accept", "")
+    if "application/octet-stream" in accept:
+        return "binary"
+    if COLUMNAR_MIMETYPE in accept:
+        return "columnar"
+    return "rows"
+
+def json_column(arr):
+    """
+    float array => list with None for NaN/inf (JSON has no NaN).
+    """
+    arr = np.asarray(arr, dtype=np.float64)
+    return np.where(np.isfinite(arr), arr, None).tolist()
+
+def working_table_response(df, fmt, meta):
+    """
+    Serializes a WORKING_TABLE slice.
+      rows     => {"data": [{"Timestamp":..., tag:...}, ...], **meta}
+      columnar => {"timestamps": [ms...], "columns": {tag: [...]}, **meta}
+      binary   => uint32 LE header length, JSON header (padded to 8 bytes),
+                  then float64 LE buffers: timestamps, then each column in
+                  header["columns"] order (NaN = missing).
+    """
+    cols = [c for c in df.columns if c != "NumericTimestamp"]
+    ts = df["NumericTimestamp"].to_numpy(dtype=np.int64)
+    if fmt == "binary":
+        header = dict(meta, format="binary", rows=int(len(df)), columns=cols, dtype="float64")
+        hbytes = json.dumps(header).encode("utf-8")
+        hbytes += b" " * ((-(4 + len(hbytes))) % 8)
+        parts = [struct.pack("<I", len(hbytes)), hbytes, ts.astype("<f8").tobytes()]
+        for c in cols:
+            parts.append(df[c].to_numpy(dtype="<f8").tobytes())
+        return Response(b"".join(parts), mimetype="application/octet-stream")
+    if fmt == "columnar":
+        body = dict(meta, format="columnar", rows=int(len(df)), timestamps=ts.tolist(),
+                    columns={c: json_column(df[c].to_numpy()) for c in cols})
+        r = jsonify(body)
+        r.mimetype = COLUMNAR_MIMETYPE
+        return r
+    df_safe = with_timestamp_column(df).replace([np.inf, -np.inf, np.nan], None)
+    return jsonify(dict(meta, data=df_safe.to_dict(orient="records")))
 
 ###############################################################################
 # BUILD WORKING_TABLE => FRONT-END
 ###############################################################################
 @app.route("/build_working_table", methods=["POST"])
 def api_build_working_table():
-    global LAST_SETTINGS, WORKING_TABLE, RAW_TABLE
+    global WORKING_TABLE, RAW_TABLE, WT_CACHE_DIRTY
+    req = request.get_json()
+    # Selected tags; deselected ones stay cached in RAW_TABLE
+    tags = req.get("tags")
+    if tags is not None:
+        with global_lock:
+            ensure_tags_resident(tags)
     if RAW_TABLE is None or RAW_TABLE.empty:
-        return jsonify({"data": [], "redrawNeeded": False})
+        empty = pd.DataFrame(columns=["NumericTimestamp"])
+        return working_table_response(empty, negotiate_wire_format(req),
+                                      {"mode": "full", "redrawNeeded": False, "total": 0})
 
-    req = request.get_json()
     dataOffset = float(req.get("dataOffset", 0))
     forwardFill = bool(req.get("forwardFill", False))
-    if LAST_SETTINGS is None:
-        LAST_SETTINGS = {}
+    cursor = req.get("version")
+    header_only = bool(req.get("headerOnly", False))
+    fmt = negotiate_wire_format(req)
 
-    need_rebuild = False
+    with global_lock:
+        need_rebuild, everything, from_ts = update_working_table(
+            offset_hours=dataOffset, forward_fill=forwardFill, tags=tags
+        )
+        if need_rebuild:
+            record_working_table_change(everything, from_ts)
+        if need_rebuild and everything:
+            user_logger.info(f"Rebuilt WORKING_TABLE with offset={dataOffset}, ff={forwardFill}, "
+                             f"{len(WT_STATE['columns']) if WT_STATE else 0} tags")
+            WT_CACHE_DIRTY = True  # written by the compaction worker, not under the lock
+        elif need_rebuild:
+            python_logger.info("WORKING_TABLE updated incrementally.")
+        else:
+            python_logger.info("No rebuild needed for WORKING_TABLE.")
+
+        wt = WORKING_TABLE
+        token = working_table_token()
+        mode, start = working_table_delta_start(cursor)
+
+    if wt is None:
+        empty = pd.DataFrame(columns=["NumericTimestamp"])
+        return working_table_response(empty, fmt, {"mode": "full", "version": token, "redrawNeeded": need_rebuild,
+                                                   "total": 0})
+
+    # Only clients that sent a cursor get delta/empty responses
+    if cursor is None:
+        mode = "full"
+    # headerOnly: the tab reads /chart_data and /table_rows, it only needs
+    # the version and the row count
+    if mode == "none" or header_only:
+        df = wt.iloc[:0]
+    elif mode == "delta":
+        pos = int(np.searchsorted(wt["NumericTimestamp"].to_numpy(), start, side="left"))
+        df = wt.iloc[pos:]
+    else:
+        df = wt
+    redraw = need_rebuild or mode != "none"
 
-    # Compare last known settings
-    if (LAST_SETTINGS.get("dataOffset") != dataOffset or
-        LAST_SETTINGS.get("forwardFill") != forwardFill):
-        need_rebuild = True
+    meta = {"mode": "none" if header_only else mode, "version": token, "redrawNeeded": redraw, "total": int(len(wt))}
+    if mode == "delta" and not header_only:
+        meta["from"] = start
+    return working_table_response(df, fmt, meta)
 
-    # If the RAW_TABLE row count changed, or columns changed, etc.
-    old_len = len(WORKING_TABLE) if WORKING_TABLE is not None else 0
-    raw_len = len(RAW_TABLE)
-    if raw_len != old_len:
-        need_rebuild = True
+###############################################################################
+# CHART DATA (downsampled series)
+###############################################################################
+CHART_POINTS_PER_PIXEL = 2
+CHART_ROLLUP_ROWS_FACTOR = 4  # rollups are used past this many rows per target point
 
-    if need_rebuild:
-        user_logger.info(f"Rebuilding WORKING_TABLE with offset={dataOffset}, ff={forwardFill}")
-        with global_lock:
-            build_working_table(offset_hours=dataOffset, forward_fill=forwardFill)
-            LAST_SETTINGS = {"dataOffset": dataOffset, "forwardFill": forwardFill}
-            save_working_table_cache()
+def lttb_indices(t, v, threshold):
+    """
+    Largest-Triangle-Three-Buckets: indices of `threshold` points that keep
+    the visual shape of (t, v).
+    """
+    n = len(t)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    tf = t.astype(np.float64)
+    every = (n - 2) / (threshold - 2)
+    idx = np.empty(threshold, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        s = int(i * every) + 1
+        e = int((i + 1) * every) + 1
+        ns, ne = e, min(int((i + 2) * every) + 1, n)
+        if ns >= ne:
+            avg_t, avg_v = tf[n - 1], v[n - 1]
+        else:
+            avg_t, avg_v = tf[ns:ne].mean(), v[ns:ne].mean()
+        area = np.abs((tf[a] - avg_t) * (v[s:e] - v[a]) - (tf[a] - tf[s:e]) * (avg_v - v[a]))
+        a = s + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+def minmax_indices(t, v, n_buckets):
+    """
+    Min/max bucketing over equal time buckets: keeps the first and last
+    point plus each bucket's minimum and maximum, so spikes survive.
+    """
+    n = len(t)
+    if n <= 2 * n_buckets or n_buckets < 1:
+        return np.arange(n)
+    span = int(t[-1] - t[0]) + 1
+    b = (t - t[0]) * n_buckets // span
+    starts = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+    bid = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+    picks = [np.array([0, n - 1])]
+    for ext in (np.minimum.reduceat(v, starts), np.maximum.reduceat(v, starts)):
+        cand = np.flatnonzero(v == ext[bid])
+        _, first = np.unique(bid[cand], return_index=True)
+        picks.append(cand[first])
+    return np.unique(np.concatenate(picks))
+
+def downsample_series(t, v, target, method="minmax"):
+    mask = np.isfinite(v)
+    t, v = t[mask], v[mask]
+    if method == "lttb":
+        idx = lttb_indices(t, v, target)
     else:
-        python_logger.info("No rebuild needed for WORKING_TABLE.")
+        idx = minmax_indices(t, v, max(1, target // 2))
+    return t[idx], v[idx]
 
-    if WORKING_TABLE is None:
-        return jsonify({"data": [], "redrawNeeded": need_rebuild})
+@app.route("/chart_data", methods=["POST"])
+def chart_data():
+    """
+    Per-tag WORKING_TABLE series for [xMin, xMax] (working NumericTimestamp
+    ms, optional) reduced to about width * CHART_POINTS_PER_PIXEL points.
+    Wide ranges are served from the rollup levels instead of raw samples,
+    unless forward fill is on: the rollups hold each tag's own samples, the
+    filled WORKING_TABLE also has values between them.
+    """
+    req = request.get_json() or {}
+    x_min = req.get("xMin")
+    x_max = req.get("xMax")
+    method = str(req.get("method", "minmax")).lower()
+    try:
+        width = max(1, int(req.get("width", 1000)))
+    except (TypeError, ValueError):
+        width = 1000
+    target = width * CHART_POINTS_PER_PIXEL
+    x_min = None if x_min is None else int(x_min)
+    x_max = None if x_max is None else int(x_max)
+
+    series = {}
+    levels = {}
+    raw_points = 0
+    with global_lock:
+        wt = WORKING_TABLE
+        token = working_table_token()
+        if wt is None or wt.empty:
+            return jsonify({"series": {}, "version": token, "rawPoints": 0})
+        ts = wt["NumericTimestamp"].to_numpy(dtype=np.int64)
+        i0 = 0 if x_min is None else int(np.searchsorted(ts, x_min, side="left"))
+        i1 = len(ts) if x_max is None else int(np.searchsorted(ts, x_max, side="right"))
+        tags = [c for c in (req.get("tags") or wt.columns) if c in wt.columns and c != "NumericTimestamp"]
+
+        # Raw rows far beyond the target: read the pre-aggregated levels. Without
+        # forward fill the row projection only drops rows where a tag has no
+        # value, so the levels show the same series.
+        if (method == "minmax" and i1 - i0 > CHART_ROLLUP_ROWS_FACTOR * target and WT_STATE is not None
+                and not WT_STATE["forward_fill"]):
+            for c in tags:
+                if c not in WT_STATE["settings"] or RAW_TABLE is None or c not in RAW_TABLE.columns:
+                    continue
+                st, sv, w, n = rollup_series(c, WT_STATE["settings"][c], WT_STATE["offset_ms"],
+                                             x_min, x_max, max(1, target // 2))
+                series[c] = {"t": st.tolist(), "v": json_column(sv)}
+                levels[c] = w
+                raw_points += n
+
+    for c in tags:
+        if c in series:
+            continue
+        v = wt[c].to_numpy(dtype=np.float64)[i0:i1]
+        raw_points += int(np.isfinite(v).sum())
+        st, sv = downsample_series(ts[i0:i1], v, target, method)
+        series[c] = {"t": st.tolist(), "v": sv.tolist()}
+        levels[c] = 0
+    return jsonify({"series": series, "version": token, "rawPoints": raw_points,
+                    "method": method, "levels": levels})
 
-    df_safe = WORKING_TABLE.replace([np.inf, -np.inf, np.nan], None)
-    return jsonify({"data": df_safe.to_dict(orient="records"), "redrawNeeded": need_rebuild})
+###############################################################################
+# TABLE ROWS (paged data table)
+###############################################################################
+TABLE_MAX_LIMIT = 1000
+
+@app.route("/table_rows", methods=["POST"])
+def table_rows():
+    """
+    One page of WORKING_TABLE rows within [xMin, xMax] (working
+    NumericTimestamp ms, optional), located by searchsorted.
+    sortOrder "desc" pages from the newest row backwards; "tags" narrows
+    the columns further.
+    """
+    req = request.get_json() or {}
+    try:
+        offset = max(0, int(req.get("offset", 0)))
+        limit = min(TABLE_MAX_LIMIT, max(0, int(req.get("limit", 200))))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid offset/limit"}), 400
+    desc = str(req.get("sortOrder", "asc")).lower() == "desc"
+    x_min = req.get("xMin")
+    x_max = req.get("xMax")
+
+    with global_lock:
+        wt = WORKING_TABLE
+        token = working_table_token()
+    if wt is None or wt.empty:
+        return jsonify({"columns": [], "rows": [], "total": 0, "offset": offset, "version": token})
+
+    ts = wt["NumericTimestamp"].to_numpy(dtype=np.int64)
+    i0 = 0 if x_min is None else int(np.searchsorted(ts, int(x_min), side="left"))
+    i1 = len(ts) if x_max is None else int(np.searchsorted(ts, int(x_max), side="right"))
+    total = max(0, i1 - i0)
+    if desc:
+        page = wt.iloc[max(i0, i1 - offset - limit):max(i0, i1 - offset)].iloc[::-1]
+    else:
+        page = wt.iloc[min(i1, i0 + offset):min(i1, i0 + offset + limit)]
+
+    if req.get("tags") is not None:
+        page = page[["NumericTimestamp"] + [c for c in req["tags"] if c in page.columns and c != "NumericTimestamp"]]
+    page = with_timestamp_column(page)
+    rows = page.astype(object).where(page.notna(), None).values.tolist()
+    return jsonify({"columns": list(page.columns), "rows": rows, "total": total,
+                    "offset": offset, "version": token})
 
 ###############################################################################
 # EXPORT EXCEL
@@ -667,18 +3058,15 @@ def export_excel():
         if WORKING_TABLE is None or WORKING_TABLE.empty:
             return jsonify({"error": "No working table data"}), 400
 
-        df = WORKING_TABLE.copy()
-        # Filter by user-specified time range
-        dt = pd.to_datetime(df["Timestamp"], format="%d/%m/%Y %H:%M:%S", errors="coerce")
-        numeric = (dt.astype(np.int64) // 1_000_000)
-        df["__ms__"] = numeric
-
+        # Filter by user-specified time range (display resolution is seconds)
+        df = WORKING_TABLE
         if start_ms is not None and end_ms is not None:
-            df = df[(df["__ms__"] >= start_ms) & (df["__ms__"] <= end_ms)]
+            secs_ms = (df["NumericTimestamp"].to_numpy() // 1000) * 1000
+            df = df[(secs_ms >= start_ms) & (secs_ms <= end_ms)]
 
-        df.drop(columns=["__ms__"], inplace=True, errors="ignore")
         if df.empty:
             return jsonify({"error": "No data in that range"}), 400
+        df = with_timestamp_column(df)
 
         cols = df.columns.tolist()
         # reorder so Timestamp is first
@@ -747,15 +3135,13 @@ def export_csv():
         if WORKING_TABLE is None or WORKING_TABLE.empty:
             return jsonify({"error": "No working table data"}), 400
 
-        df = WORKING_TABLE.copy()
-        dt = pd.to_datetime(df["Timestamp"], format="%d/%m/%Y %H:%M:%S", errors="coerce")
-        numeric = (dt.astype(np.int64) // 1_000_000)
-        df["__ms__"] = numeric
+        df = WORKING_TABLE
         if start_ms is not None and end_ms is not None:
-            df = df[(df["__ms__"] >= start_ms) & (df["__ms__"] <= end_ms)]
-        df.drop(columns=["__ms__"], inplace=True, errors="ignore")
+            secs_ms = (df["NumericTimestamp"].to_numpy() // 1000) * 1000
+            df = df[(secs_ms >= start_ms) & (secs_ms <= end_ms)]
         if df.empty:
             return jsonify({"error": "No data in that range"}), 400
+        df = with_timestamp_column(df)
 
         cols = df.columns.tolist()
         if "Timestamp" in cols:
@@ -853,9 +3239,12 @@ def tag_settings():
                 return jsonify(json.load(f))
         return jsonify({"scale_factors":{},"max_decimal":{},"error_value":{}})
     else:
+        global TAG_SETTINGS
         try:
             d = request.get_json()
             atomic_write_json(tp, d)
+            # the next WORKING_TABLE update rebuilds only columns whose settings changed
+            TAG_SETTINGS = d
             return jsonify({"status":"ok"})
         except:
             return jsonify({"error":"fail"}),500
@@ -865,18 +3254,35 @@ def tag_settings():
 ###############################################################################
 @app.route("/clear_cache", methods=["POST"])
 def clear_cache():
-    global RAW_TABLE, WORKING_TABLE, TAGLIST_CACHE, TAG_COVERAGE, RAW_TABLE_SIGNATURE
+    global RAW_TABLE, WORKING_TABLE, TAGLIST_CACHE, TAG_COVERAGE, TAG_ETAGS, RAW_TABLE_SIGNATURE, RAW_DIRTY_FROM, WT_STATE, WT_EPOCH
+    global WT_CACHE_DIRTY
     with global_lock:
         RAW_TABLE = None
         WORKING_TABLE = None
+        WT_CACHE_DIRTY = False
         TAGLIST_CACHE = None
         TAG_COVERAGE = {}
+        TAG_ETAGS = {}
         RAW_TABLE_SIGNATURE = None
+        RAW_DIRTY_FROM = None
+        WT_STATE = None
+        WT_EPOCH = os.urandom(4).hex()
+        RAW_DIRTY_TAGS.clear()
+        ROLLUPS.clear()
+        BLOCK_ACCESS.clear()
+        EVICTED_BLOCKS.clear()
+        RAW_WIDENED.clear()
+        try:
+            get_raw_cache().clear()
+        except Exception as e:
+            python_logger.error(f"Error clearing RAW_TABLE cache: {e}")
         for path in [
             get_taglist_cache_path(),
             get_raw_table_cache_path(),
             get_working_table_cache_path(),
-            get_tag_coverage_cache_path()
+            get_tag_coverage_cache_path(),
+            get_tag_coverage_log_path(),
+            get_tag_etags_path()
         ]:
             if os.path.exists(path):
                 try:
@@ -888,6 +3294,7 @@ def clear_cache():
 
 @app.route("/shutdown", methods=["POST"])
 def shutdown():
+    compact_caches()
     sd = request.environ.get("werkzeug.server.shutdown")
     if sd:
         python_logger.info("Server shutting down via /shutdown endpoint.")
@@ -897,6 +3304,7 @@ def shutdown():
 @app.route("/restart", methods=["POST"])
 def restart():
     def do_restart():
+        compact_caches()
         pyExe = sys.executable
         script = os.path.abspath(__file__)
         time.sleep(1)
@@ -952,13 +3360,15 @@ def start_tray():
 # MAIN
 ###############################################################################
 def run_flask():
-    global RAW_TABLE, WORKING_TABLE, TAG_COVERAGE, RAW_TABLE_SIGNATURE
+    global RAW_TABLE, WORKING_TABLE, TAG_COVERAGE, TAG_ETAGS, RAW_TABLE_SIGNATURE
 
-    # Load caches at startup
-    RAW_TABLE = load_raw_table_cache()
+    # Load caches at startup (columnar tags are memory-mapped lazily on first request)
+    RAW_TABLE = load_raw_table_cache([] if RAW_CACHE_BACKEND == "columnar" else None)
     WORKING_TABLE = load_working_table_cache()
-    TAG_COVERAGE = load_tag_coverage()
+    TAG_COVERAGE, TAG_ETAGS = load_tag_coverage()
     RAW_TABLE_SIGNATURE = get_raw_table_signature(RAW_TABLE)
+    threading.Thread(target=compaction_worker, daemon=True).start()
+    threading.Thread(target=live_tail_worker, daemon=True).start()
 
     app.run(host="127.0.0.1", port=UI_PORT, threaded=True)
 
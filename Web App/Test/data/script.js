@@ -3,8 +3,8 @@ document.addEventListener("DOMContentLoaded", function () {
   // ------------------------------------------------
   // GLOBAL STATE
   // ------------------------------------------------
-  let WORKING_TABLE = [];    
-  let DISPLAYED_DATA = [];   
+  let WT_ROWS        = 0;      // rows in the server WORKING_TABLE (chart/table page it from there)
+  let DISPLAYED_RANGE = null;   // chart x-range shown in the table/PDF, null => everything
   let selectedTags   = new Set(); 
   let fullTagList    = [];   
   let displayTagList = [];   
@@ -23,6 +23,7 @@ document.addEventListener("DOMContentLoaded", function () {
   let autoRefreshTimer = null;
   let CURRENT_XMIN   = null;
   let CURRENT_XMAX   = null;
+  let WT_VERSION     = null;   // server version token of the WORKING_TABLE we display
 
   // CHANGED: We'll store the date/time from site settings
   let startDateStr   = "";
@@ -193,6 +194,7 @@ document.addEventListener("DOMContentLoaded", function () {
           if (selectedTags.has(item.Tag)) selectedTags.delete(item.Tag);
           else selectedTags.add(item.Tag);
           buildTreeWithGrouping();
+          selectionChanged();
         });
         ul.appendChild(li);
       });
@@ -247,6 +249,7 @@ document.addEventListener("DOMContentLoaded", function () {
             if (selectedTags.has(obj.full)) selectedTags.delete(obj.full);
             else selectedTags.add(obj.full);
             buildTreeWithGrouping();
+            selectionChanged();
           });
           subUl.appendChild(li);
         });
@@ -328,6 +331,7 @@ document.addEventListener("DOMContentLoaded", function () {
               if (selectedTags.has(obj.full)) selectedTags.delete(obj.full);
               else selectedTags.add(obj.full);
               buildTreeWithGrouping();
+              selectionChanged();
             });
             thirdUl.appendChild(li3);
           });
@@ -352,11 +356,13 @@ document.addEventListener("DOMContentLoaded", function () {
   document.getElementById("selectAllBtn").addEventListener("click", ()=>{
     displayTagList.forEach(t => selectedTags.add(t.Tag));
     buildTreeWithGrouping();
+    selectionChanged();
     sendLogEvent("user", "User selected all displayed tags");
   });
   document.getElementById("deselectAllBtn").addEventListener("click", ()=>{
     displayTagList.forEach(t => selectedTags.delete(t.Tag));
     buildTreeWithGrouping();
+    selectionChanged();
     sendLogEvent("user","User deselected all displayed tags");
   });
   document.getElementById("refreshTagsBtn").addEventListener("click", async ()=>{
@@ -417,6 +423,7 @@ document.addEventListener("DOMContentLoaded", function () {
       btn.classList.add("selected");
       await saveSiteSettings();
       buildTreeWithGrouping();
+      if (tableView) updateDisplayedData(DISPLAYED_RANGE && DISPLAYED_RANGE.min, DISPLAYED_RANGE && DISPLAYED_RANGE.max);
       sendLogEvent("user","Sort order => "+sortOrder);
     });
   });
@@ -562,12 +569,49 @@ document.addEventListener("DOMContentLoaded", function () {
     return (Date.now() - ed.getTime() < 3600000);
   }
 
+  // Server push: /live announces appended WORKING_TABLE rows for our tags
+  let liveSource = null;
+
+  function openLiveStream() {
+    const params = new URLSearchParams();
+    selectedTags.forEach(t => params.append("tag", t));
+    params.set("interval", pollInterval);
+    params.set("since", Math.floor((CURRENT_XMAX || Date.now()) / 1000));
+    const es = new EventSource("/live?" + params.toString());
+    es.onmessage = async ev => {
+      const msg = JSON.parse(ev.data);
+      CURRENT_XMAX = Date.now();
+      if (msg.type === "delta" && msg.base === WT_VERSION && !rebuildRunning) {
+        await applyLiveDelta(msg);
+      } else {
+        await requestRebuild();
+      }
+    };
+    es.onerror = () => {
+      // EventSource reconnects by itself; once closed, the timer polls instead
+      if (es.readyState === EventSource.CLOSED && liveSource === es) {
+        liveSource = null;
+        logStatus("AutoRefresh: live stream closed, polling instead.");
+      }
+    };
+    liveSource = es;
+    return true;
+  }
+
+  function closeLiveStream() {
+    if (liveSource) {
+      liveSource.close();
+      liveSource = null;
+    }
+  }
+
   function startAutoRefresh() {
     stopAutoRefresh();
-    logStatus(`AutoRefresh ON (interval=${pollInterval}ms)`);
+    const live = !!window.EventSource && openLiveStream();
+    logStatus(`AutoRefresh ON (interval=${pollInterval}ms, ${live ? "server push" : "polling"})`);
     autoRefreshTimer = setInterval(()=>{
       if (isLiveData()) {
-        autoRefreshFetch();
+        if (!liveSource) autoRefreshFetch();
       } else {
         document.getElementById("autoRefreshToggle").checked = false;
         stopAutoRefresh();
@@ -577,6 +621,7 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   function stopAutoRefresh() {
+    closeLiveStream();
     if (autoRefreshTimer) {
       clearInterval(autoRefreshTimer);
       autoRefreshTimer = null;
@@ -621,7 +666,7 @@ document.addEventListener("DOMContentLoaded", function () {
       const j = await r.json();
       if (j.newData || j.redrawNeeded) {
         CURRENT_XMAX = nowMs;
-        await rebuildWorkingTable();
+        await requestRebuild();
       } else {
         logStatus("AutoRefresh: no new data fetched.");
       }
@@ -656,12 +701,85 @@ document.addEventListener("DOMContentLoaded", function () {
   // ------------------------------------------------
   // MANUAL FETCH
   // ------------------------------------------------
-  document.getElementById("graphBtn").addEventListener("click", ()=>{
+  // Shift+click also re-validates the cached range with the historian
+  document.getElementById("graphBtn").addEventListener("click", (ev)=>{
     stopAutoRefresh();
-    onGraph();
+    onGraph(ev.shiftKey);
   });
 
-  async function onGraph() {
+  // ------------------------------------------------
+  // ASYNC FETCH JOBS
+  // ------------------------------------------------
+  let activeFetchJob = null;
+
+  // Streams job snapshots to onProgress until the job ends; uses
+  // /fetch_events (SSE) and falls back to polling /fetch_status.
+  function watchFetchJob(jobId, onProgress) {
+    return new Promise(resolve => {
+      const poll = async () => {
+        while (true) {
+          try {
+            const r = await fetch(`/fetch_status/${jobId}`);
+            if (!r.ok) { resolve({ status: "error", error: "HTTP " + r.status }); return; }
+            const snap = await r.json();
+            onProgress(snap);
+            if (snap.status !== "running") { resolve(snap); return; }
+          } catch(e) {
+            resolve({ status: "error", error: e.message });
+            return;
+          }
+          await new Promise(res => setTimeout(res, 500));
+        }
+      };
+      if (!window.EventSource) { poll(); return; }
+      const es = new EventSource(`/fetch_events/${jobId}`);
+      es.onmessage = ev => {
+        const snap = JSON.parse(ev.data);
+        onProgress(snap);
+        if (snap.status !== "running") {
+          es.close();
+          resolve(snap);
+        }
+      };
+      es.onerror = () => {
+        es.close();
+        poll();
+      };
+    });
+  }
+
+  function cancelFetchJob(jobId) {
+    fetch(`/fetch_cancel/${jobId}`, { method:"POST" }).catch(() => {});
+  }
+
+  // rebuildWorkingTable one at a time; requests made meanwhile coalesce into one more run
+  let rebuildRunning = null;
+  let rebuildQueued  = false;
+  function requestRebuild() {
+    if (rebuildRunning) {
+      rebuildQueued = true;
+      return rebuildRunning;
+    }
+    rebuildRunning = (async () => {
+      do {
+        rebuildQueued = false;
+        await rebuildWorkingTable();
+      } while (rebuildQueued);
+      rebuildRunning = null;
+    })();
+    return rebuildRunning;
+  }
+
+  // The tag selection only projects the server's cached data: re-project
+  // the working table without fetching (Graph fetches what is missing)
+  let selectionTimer = null;
+  function selectionChanged() {
+    if (WT_VERSION === null) return;
+    clearTimeout(selectionTimer);
+    selectionTimer = setTimeout(() => requestRebuild(), 150);
+  }
+
+  async function onGraph(revalidate = false) {
     if (!selectedTags.size) {
       logStatus("No tags selected.");
       return;
@@ -678,16 +796,19 @@ document.addEventListener("DOMContentLoaded", function () {
     const enU = Math.floor(ed2.getTime()/1000);
     CURRENT_XMIN = sd.getTime();
     CURRENT_XMAX = ed2.getTime();
-    logStatus(`Fetching data from ${stU} to ${enU}...`);
+    logStatus(`${revalidate ? "Re-validating" : "Fetching"} data from ${stU} to ${enU}...`);
     sendLogEvent("user", `Manual fetch for tags: ${Array.from(selectedTags).join(", ")}`);
 
     const pay = {
       tags: Array.from(selectedTags),
       startDateUnixSeconds: stU,
       endDateUnixSeconds: enU,
-      autoRefresh: false
+      autoRefresh: false,
+      async: true,
+      revalidate: revalidate
     };
     try {
+      if (activeFetchJob) cancelFetchJob(activeFetchJob);
       const r = await fetch("/fetch_data", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
@@ -698,22 +819,155 @@ document.addEventListener("DOMContentLoaded", function () {
         return;
       }
       const j = await r.json();
-      if (j.newData || j.redrawNeeded) {
-        await rebuildWorkingTable();
+      if (!j.jobId) {
+        if (j.newData || j.redrawNeeded) await requestRebuild();
+        else logStatus("No new data fetched.");
+        return;
+      }
+
+      // Draw tags as their chunks are committed instead of waiting for all
+      const jobId = j.jobId;
+      activeFetchJob = jobId;
+      let commits = 0;
+      const fin = await watchFetchJob(jobId, snap => {
+        if (activeFetchJob !== jobId) return;
+        const nTags = Object.keys(snap.tags || {}).length;
+        logStatus(`Fetching: ${snap.tagsDone}/${nTags} tags, ${snap.rowsFetched} rows, ${snap.rowsPerSecond} rows/s`);
+        if (snap.commits > commits && snap.newData) {
+          commits = snap.commits;
+          requestRebuild();
+        }
+      });
+      if (activeFetchJob !== jobId) return;
+      activeFetchJob = null;
+      if (fin.status === "error") {
+        logStatus("Error fetching new data: " + fin.error);
+      } else if (fin.newData) {
+        await requestRebuild();
+        logStatus(`Fetch ${fin.status}: ${fin.rowsFetched} rows in ${fin.elapsed}s`);
       } else {
-        logStatus("No new data fetched.");
+        logStatus(fin.status === "cancelled" ? "Fetch cancelled." : "No new data fetched.");
       }
     } catch(e) {
       logStatus("Error fetching new data: " + e.message);
     }
   }
 
+
   // ------------------------------------------------
   // BUILD/UPDATE WORKING TABLE
   // ------------------------------------------------
+  // The chart and table page WORKING_TABLE from the server; a local copy
+  // is only downloaded for the PDF report, kept columnar as sent:
+  //   ts   = server NumericTimestamp (offset wall-clock ms)
+  //   x    = chart x value (that wall-clock read as browser-local time)
+  //   cols = { tag: Float64Array } with NaN for missing values
+
+  // Same result as Date.parse() of the formatted "dd/mm/yyyy HH:MM:SS"
+  // Timestamp read as local time, without any strings; the local UTC offset
+  // is cached per hour.
+  const localOffsetCache = new Map();
+  function wallClockToLocalMs(ms) {
+    const sec = Math.floor(ms / 1000) * 1000;
+    const hour = Math.floor(ms / 3600000);
+    let off = localOffsetCache.get(hour);
+    if (off === undefined) {
+      const d = new Date(hour * 3600000);
+      off = new Date(d.getUTCFullYear(), d.getUTCMonth(), d.getUTCDate(), d.getUTCHours()).getTime() - hour * 3600000;
+      localOffsetCache.set(hour, off);
+    }
+    return sec + off;
+  }
+
+  function fmtWallClock(ms) {
+    const d = new Date(ms);
+    const p = n => String(n).padStart(2, "0");
+    return `${p(d.getUTCDate())}/${p(d.getUTCMonth()+1)}/${d.getUTCFullYear()} ` +
+      `${p(d.getUTCHours())}:${p(d.getUTCMinutes())}:${p(d.getUTCSeconds())}`;
+  }
+
+  // First index whose value >= v in a sorted array
+  function lowerBound(arr, v) {
+    let lo = 0, hi = arr.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (arr[mid] < v) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+  }
+
+  // Parses the binary /build_working_table layout:
+  // uint32 header length, JSON header, float64 timestamps, float64 per column
+  async function readBinaryWorkingTable(r) {
+    const buf = await r.arrayBuffer();
+    const hlen = new DataView(buf).getUint32(0, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buf, 4, hlen)));
+    const n = header.rows;
+    let off = 4 + hlen;
+    const ts = new Float64Array(buf, off, n);
+    off += n * 8;
+    const cols = {};
+    header.columns.forEach(c => {
+      cols[c] = new Float64Array(buf, off, n);
+      off += n * 8;
+    });
+    return { header, ts, cols };
+  }
+
+  // Applies a working-table header (version, row count) and redraws
+  async function applyWorkingTableHeader(j) {
+    WT_VERSION = j.version || null;
+    WT_ROWS = j.total || 0;
+
+    if (!WT_ROWS) {
+      if (chart) { chart.destroy(); chart=null; }
+      clearTable();
+      logStatus("No data in working table.");
+      return;
+    }
+    if (j.redrawNeeded || !chart) {
+      await buildChart();
+    } else {
+      // Just update chart data if needed, but we rely on current extremes
+      const ex = chart.xAxis[0].getExtremes();
+      updateDisplayedData(ex.min, ex.max);
+    }
+  }
+
+  // Live delta: rows from msg.from onward changed. Only the visible chart
+  // range is re-read (one /chart_data call), extended to now when the view
+  // reaches the new rows; a view further back in time is left alone.
+  const LIVE_FOLLOW_SLACK_MS = 60000;
+  async function applyLiveDelta(msg) {
+    if (!chart || !WT_ROWS) {
+      await applyWorkingTableHeader(msg);
+      return;
+    }
+    WT_VERSION = msg.version || null;
+    WT_ROWS = msg.total || 0;
+    const ex = chart.xAxis[0].getExtremes();
+    if (ex.max < wallClockToLocalMs(msg.from) - LIVE_FOLLOW_SLACK_MS) return;
+    const xMax = Math.max(ex.max, CURRENT_XMAX);
+    let data;
+    try {
+      data = await fetchChartData(ex.min, xMax);
+    } catch(e) {
+      logStatus("chart_data error: " + e.message);
+      return;
+    }
+    if (!chart) return;
+    chart.series.forEach(s => {
+      if (!s.options.isInternal && data[s.name]) s.setData(data[s.name], false);
+    });
+    // setExtremes updates the data table; "live" skips loadChartDetail
+    chart.xAxis[0].setExtremes(ex.min, xMax, false, false, { trigger: "live" });
+    chart.redraw();
+  }
+
   async function rebuildWorkingTable() {
     try {
-      const pay = { dataOffset, forwardFill };
+      const pay = { dataOffset, forwardFill, tags: Array.from(selectedTags), version: WT_VERSION,
+                    format: "columnar", headerOnly: true };
       const r = await fetch("/build_working_table", {
         method:"POST",
         headers: {"Content-Type": "application/json"},
@@ -723,62 +977,118 @@ document.addEventListener("DOMContentLoaded", function () {
         logStatus("build_working_table error: HTTP " + r.status);
         return;
       }
-      const j = await r.json();
-      WORKING_TABLE = j.data || [];
-
-      if (!WORKING_TABLE.length) {
-        if (chart) { chart.destroy(); chart=null; }
-        clearTable();
-        logStatus("No data in working table.");
-        return;
-      }
-      if (j.redrawNeeded || !chart) {
-        buildChart(WORKING_TABLE);
-      } else {
-        // Just update chart data if needed, but we rely on current extremes
-        const ex = chart.xAxis[0].getExtremes();
-        updateDisplayedData(ex.min, ex.max);
-      }
+      await applyWorkingTableHeader(await r.json());
     } catch(e) {
       logStatus("rebuildWorkingTable error: " + e.message);
     }
   }
 
-  function parseDateMs(dtStr){
-    // dtStr is "dd/mm/yyyy HH:MM:SS"
-    const parts = dtStr.split(" ");
-    if (parts.length < 2) return NaN;
-    const dPart = parts[0];
-    const tPart = parts[1];
-    const dArr  = dPart.split("/");
-    if (dArr.length < 3) return NaN;
-    const isoStr = `${dArr[2]}-${dArr[1]}-${dArr[0]} ${tPart}`;
-    return Date.parse(isoStr);
+  // Full binary copy of WORKING_TABLE, downloaded on demand (PDF report)
+  async function loadWorkingTable() {
+    const pay = { dataOffset, forwardFill, tags: Array.from(selectedTags), format: "binary" };
+    const r = await fetch("/build_working_table", {
+      method:"POST",
+      headers: {"Content-Type": "application/json", "Accept": "application/octet-stream"},
+      body: JSON.stringify(pay)
+    });
+    if (!r.ok) throw new Error("HTTP " + r.status);
+    const { ts, cols } = await readBinaryWorkingTable(r);
+    return { ts, x: ts.map(wallClockToLocalMs), cols };
+  }
+
+  // Row objects (for the PDF) for rows [i0, i1) of a loaded working table
+  function workingRows(wt, i0, i1) {
+    const names = Object.keys(wt.cols);
+    const rows = new Array(Math.max(0, i1 - i0));
+    for (let i = i0; i < i1; i++) {
+      const row = { Timestamp: fmtWallClock(wt.ts[i]), NumericTimestamp: wt.ts[i] };
+      names.forEach(c => {
+        const v = wt.cols[c][i];
+        row[c] = Number.isNaN(v) ? null : v;
+      });
+      row.__ms__ = wt.x[i];
+      rows[i - i0] = row;
+    }
+    return rows;
   }
 
-  function buildChart(rows){
-    if (!rows.length) {
-      DISPLAYED_DATA = [];
+  // Inverse of wallClockToLocalMs: chart x back to working-table ms
+  function localMsToWallClock(x) {
+    const d = new Date(x);
+    return Date.UTC(d.getFullYear(), d.getMonth(), d.getDate(),
+      d.getHours(), d.getMinutes(), d.getSeconds(), d.getMilliseconds());
+  }
+
+  // Downsampled [x, y] series per tag from /chart_data for the chart range
+  // [xMin, xMax] (whole working table when null)
+  async function fetchChartData(xMin, xMax) {
+    const width = document.getElementById("chartContainer").clientWidth || 1000;
+    const pay = { width, method: "minmax" };
+    if (xMin != null && xMax != null) {
+      pay.xMin = localMsToWallClock(xMin);
+      pay.xMax = localMsToWallClock(xMax);
+    }
+    const r = await fetch("/chart_data", {
+      method:"POST",
+      headers: {"Content-Type": "application/json"},
+      body: JSON.stringify(pay)
+    });
+    if (!r.ok) throw new Error("HTTP " + r.status);
+    const j = await r.json();
+    const out = {};
+    Object.entries(j.series).forEach(([c, s]) => {
+      out[c] = s.t.map((t, i) => [wallClockToLocalMs(t), s.v[i]]);
+    });
+    return out;
+  }
+
+  // Replace the chart series with a higher-resolution slice for the visible range
+  let chartDetailSeq = 0;
+  async function loadChartDetail(xMin, xMax) {
+    if (!chart) return;
+    const seq = ++chartDetailSeq;
+    chart.showLoading("Loading...");
+    try {
+      const data = await fetchChartData(xMin, xMax);
+      if (!chart || seq !== chartDetailSeq) return;
+      chart.series.forEach(s => {
+        if (!s.options.isInternal && data[s.name]) s.setData(data[s.name], false);
+      });
+      chart.redraw();
+    } catch(e) {
+      logStatus("chart_data error: " + e.message);
+    } finally {
+      if (chart && seq === chartDetailSeq) chart.hideLoading();
+    }
+  }
+
+  async function buildChart(){
+    if (!WT_ROWS) {
+      DISPLAYED_RANGE = null;
+      tableView = null;
       clearTable();
       if (chart) { chart.destroy(); chart=null; }
       logStatus("No data to display.");
       return;
     }
-    const augmented = rows.map(r => ({...r, __ms__: parseDateMs(r.Timestamp)}));
-    let colNames = Object.keys(augmented[0]).filter(k=> k !== "Timestamp" && k !== "__ms__" && k !== "NumericTimestamp");
-    // ensure numeric
-    colNames = colNames.filter(c => augmented.some(a => !isNaN(parseFloat(a[c]))));
+    // overview of the whole table, also used for the navigator
+    let overview;
+    try {
+      overview = await fetchChartData(null, null);
+    } catch(e) {
+      logStatus("chart_data error: " + e.message);
+      return;
+    }
+    const colNames = Object.keys(overview).filter(c => overview[c].length);
     if (!colNames.length) {
-      DISPLAYED_DATA = [];
+      DISPLAYED_RANGE = null;
+      tableView = null;
       clearTable();
       if (chart) { chart.destroy(); chart=null; }
       logStatus("No numeric data columns found.");
       return;
     }
-    const seriesArr = colNames.map(c => {
-      const d = augmented.map(r => [r.__ms__, parseFloat(r[c])]);
-      return { name: c, data: d };
-    });
+    const seriesArr = colNames.map(c => ({ name: c, data: overview[c] }));
 
     const dm = document.body.classList.contains("dark-mode");
     const bg = dm ? "#2e2e2e" : "#fff";
@@ -796,11 +1106,10 @@ document.addEventListener("DOMContentLoaded", function () {
           plotLines: [],
           events: {
             setExtremes: function(e) {
-              if (e.min == null || e.max == null) {
-                DISPLAYED_DATA = [...augmented];
-              } else {
-                updateDisplayedData(e.min, e.max);
-              }
+              updateDisplayedData(e.min, e.max);
+            },
+            afterSetExtremes: function(e) {
+              if (e.trigger !== "live") loadChartDetail(e.min, e.max);
             }
           }
         },
@@ -811,8 +1120,8 @@ document.addEventListener("DOMContentLoaded", function () {
           tickColor: tc
         },
         legend: { enabled: true, itemStyle:{ color: tc } },
-        navigator:{ enabled: true },
-        scrollbar:{ enabled: true },
+        navigator:{ enabled: true, adaptToUpdatedData: false, series: { data: overview[colNames[0]] } },
+        scrollbar:{ enabled: true, liveRedraw: false },
         rangeSelector:{ enabled: false },
         tooltip:{ shared: true, crosshairs: true },
         series: seriesArr,
@@ -820,7 +1129,7 @@ document.addEventListener("DOMContentLoaded", function () {
       });
     } else {
       // update existing
-      const existingSeries = chart.series.map(s => s.name);
+      const existingSeries = chart.series.filter(s => !s.options.isInternal).map(s => s.name);
       const toRemove = existingSeries.filter(n => !colNames.includes(n));
       const toAdd    = colNames.filter(n => !existingSeries.includes(n));
       const toUpdate = colNames.filter(n => existingSeries.includes(n));
@@ -830,20 +1139,20 @@ document.addEventListener("DOMContentLoaded", function () {
         if (s) s.remove(false);
       });
       toAdd.forEach(ad => {
-        const d = augmented.map(r => [r.__ms__, parseFloat(r[ad])]);
-        chart.addSeries({ name:ad, data:d }, false);
+        chart.addSeries({ name:ad, data:overview[ad] }, false);
       });
       toUpdate.forEach(up => {
         const s = chart.series.find(xx => xx.name===up);
         if (s) {
-          const d = augmented.map(r => [r.__ms__, parseFloat(r[up])]);
-          s.setData(d, false);
+          s.setData(overview[up], false);
         }
       });
+      if (chart.navigator && chart.navigator.series && chart.navigator.series[0]) {
+        chart.navigator.series[0].setData(overview[colNames[0]], false);
+      }
       chart.redraw();
     }
     // set display data initially
-    DISPLAYED_DATA = augmented;
     if (CURRENT_XMIN != null && CURRENT_XMAX != null) {
       chart.xAxis[0].setExtremes(CURRENT_XMIN, CURRENT_XMAX, false);
       chart.redraw();
@@ -853,59 +1162,151 @@ document.addEventListener("DOMContentLoaded", function () {
     }
   }
 
+  // ------------------------------------------------
+  // DATA TABLE (virtual scroll over /table_rows pages)
+  // ------------------------------------------------
+  const TABLE_ROW_HEIGHT = 30;
+  const TABLE_PAGE_SIZE  = 200;
+  const TABLE_MAX_PAGES  = 50;
+  // Browsers cap element heights (Firefox ~17.9M px): past this the spacer
+  // is scaled and scrollTop maps to a row index proportionally
+  const TABLE_MAX_SPACER_PX = 1e7;
+  let tableView = null;   // { range, total, columns, pages: Map(page => rows), pending: Set }
+
   function updateDisplayedData(minVal, maxVal) {
     // If null, means "show all"
-    if (minVal == null || maxVal == null) {
-      DISPLAYED_DATA = WORKING_TABLE.map(r => ({...r, __ms__: parseDateMs(r.Timestamp)}));
-    } else {
-      DISPLAYED_DATA = WORKING_TABLE
-        .map(r => ({...r, __ms__: parseDateMs(r.Timestamp)}))
-        .filter(r => r.__ms__ >= minVal && r.__ms__ <= maxVal);
-    }
+    DISPLAYED_RANGE = (minVal == null || maxVal == null) ? null : { min: minVal, max: maxVal };
+    tableView = { range: DISPLAYED_RANGE, total: null, columns: [], pages: new Map(), pending: new Set() };
     buildDataTable();
   }
 
+  // Row objects for the displayed range (PDF report)
+  async function displayedRows() {
+    const wt = await loadWorkingTable();
+    if (!DISPLAYED_RANGE) return workingRows(wt, 0, wt.ts.length);
+    const i0 = lowerBound(wt.x, DISPLAYED_RANGE.min);
+    const i1 = lowerBound(wt.x, DISPLAYED_RANGE.max + 1);
+    return workingRows(wt, i0, i1);
+  }
+
+  async function fetchTablePage(view, page) {
+    if (view.pages.has(page) || view.pending.has(page)) return;
+    view.pending.add(page);
+    const pay = { offset: page * TABLE_PAGE_SIZE, limit: TABLE_PAGE_SIZE, sortOrder };
+    if (view.range) {
+      pay.xMin = localMsToWallClock(view.range.min);
+      pay.xMax = localMsToWallClock(view.range.max);
+    }
+    try {
+      const r = await fetch("/table_rows", {
+        method:"POST",
+        headers: {"Content-Type": "application/json"},
+        body: JSON.stringify(pay)
+      });
+      if (!r.ok) {
+        logStatus("table_rows error: HTTP " + r.status);
+        return;
+      }
+      const j = await r.json();
+      if (view !== tableView) return;
+      if (view.pages.size >= TABLE_MAX_PAGES) {
+        view.pages.delete(view.pages.keys().next().value);
+      }
+      view.pages.set(page, j.rows);
+      const first = view.total == null;
+      view.total = j.total;
+      view.columns = j.columns;
+      if (first) buildDataTable(); else renderTableWindow();
+    } catch(e) {
+      logStatus("table_rows error: " + e.message);
+    } finally {
+      view.pending.delete(page);
+    }
+  }
+
   function clearTable(){
     document.getElementById("dataTableHeaderContainer").innerHTML = "";
     document.getElementById("dataTableBodyContainer").innerHTML = "";
   }
 
-  // CHANGED: Build the data table in the client from DISPLAYED_DATA
+  // CHANGED: The table body is a spacer as tall as every row; only the rows
+  // in view are rendered, fetched a page at a time from the server
   function buildDataTable(){
     const headerDiv = document.getElementById("dataTableHeaderContainer");
     const bodyDiv   = document.getElementById("dataTableBodyContainer");
+    const view = tableView;
+    if (!view) {
+      clearTable();
+      return;
+    }
+    if (view.total == null) {
+      fetchTablePage(view, 0);
+      return;
+    }
     headerDiv.innerHTML = "";
     bodyDiv.innerHTML   = "";
-    if (!DISPLAYED_DATA.length) {
+    if (!view.total) {
       headerDiv.innerHTML = "<p>No data</p>";
       return;
     }
 
-    // gather columns
-    const columns = Object.keys(DISPLAYED_DATA[0]).filter(k => k !== "__ms__");
-    // We'll just do a simple <table> with a single header row:
-    let html = "<table class='server-table' border='1'><thead><tr>";
-    for (let c of columns){
-      html += `<th>${c}</th>`;
-    }
-    html += "</tr></thead><tbody>";
-    DISPLAYED_DATA.forEach(row => {
-      html += "<tr>";
-      for (let c of columns){
-        const val = (row[c] == null || row[c] === undefined) ? "" : row[c];
-        html += `<td>${val}</td>`;
-      }
-      html += "</tr>";
-    });
-    html += "</tbody></table>";
-
-    headerDiv.innerHTML = "<div class='fixed-table-header'>" + 
-      columns.map(c => `<div>${c}</div>`).join("") + "</div>"; 
-    // Just for display, or you can skip a separate "header" container
-    bodyDiv.innerHTML = html;
+    headerDiv.innerHTML = "<div class='fixed-table-header'>" +
+      view.columns.map(c => `<div>${c}</div>`).join("") + "</div>";
+    bodyDiv.innerHTML = `<div class='virtual-table-spacer' style='height:${tableSpacerHeight(view.total)}px'>` +
+      "<table class='server-table virtual-table' border='1'><tbody></tbody></table></div>";
+    bodyDiv.scrollTop = 0;
     setHeightsFromRatio();
+    renderTableWindow();
+  }
+
+  function tableSpacerHeight(total) {
+    return Math.min(total * TABLE_ROW_HEIGHT, TABLE_MAX_SPACER_PX);
+  }
+
+  // (Fractional) row index at the top of the viewport
+  function tableTopRow(view, bodyDiv) {
+    const spacer = tableSpacerHeight(view.total);
+    if (spacer === view.total * TABLE_ROW_HEIGHT) return bodyDiv.scrollTop / TABLE_ROW_HEIGHT;
+    const scrollRange = spacer - bodyDiv.clientHeight;
+    const rowRange = view.total - bodyDiv.clientHeight / TABLE_ROW_HEIGHT;
+    return scrollRange > 0 ? bodyDiv.scrollTop / scrollRange * rowRange : 0;
+  }
+
+  function renderTableWindow() {
+    const view = tableView;
+    const bodyDiv = document.getElementById("dataTableBodyContainer");
+    const table = bodyDiv.querySelector(".virtual-table");
+    if (!view || !view.total || !table) return;
+    const top   = tableTopRow(view, bodyDiv);
+    const first = Math.max(0, Math.floor(top) - 10);
+    const last  = Math.min(view.total, Math.ceil(top + bodyDiv.clientHeight / TABLE_ROW_HEIGHT) + 10);
+    let html = "";
+    for (let i = first; i < last; i++) {
+      const page = Math.floor(i / TABLE_PAGE_SIZE);
+      const rows = view.pages.get(page);
+      const row = rows && rows[i - page * TABLE_PAGE_SIZE];
+      if (!row) {
+        fetchTablePage(view, page);
+        html += "<tr>" + view.columns.map(() => "<td></td>").join("") + "</tr>";
+        continue;
+      }
+      html += "<tr>" + row.map(v => `<td>${v == null ? "" : v}</td>`).join("") + "</tr>";
+    }
+    // row `top` sits at the top of the viewport
+    table.style.top = (bodyDiv.scrollTop - (top - first) * TABLE_ROW_HEIGHT) + "px";
+    table.tBodies[0].innerHTML = html;
   }
 
+  let tableScrollPending = false;
+  document.getElementById("dataTableBodyContainer").addEventListener("scroll", () => {
+    if (tableScrollPending) return;
+    tableScrollPending = true;
+    requestAnimationFrame(() => {
+      tableScrollPending = false;
+      renderTableWindow();
+    });
+  });
+
   // ------------------------------------------------
   // EXPORT
   // ------------------------------------------------
@@ -977,7 +1378,14 @@ document.addEventListener("DOMContentLoaded", function () {
       logStatus("No chart present for PDF.");
       return;
     }
-    if (!DISPLAYED_DATA.length) {
+    let pdfRows;
+    try {
+      pdfRows = await displayedRows();
+    } catch(e) {
+      logStatus("PDF data error: " + e.message);
+      return;
+    }
+    if (!pdfRows.length) {
       logStatus("No data in chart range for PDF.");
       return;
     }
@@ -1027,9 +1435,9 @@ document.addEventListener("DOMContentLoaded", function () {
       doc.setFontSize(12);
       doc.text("Data Table", margin, 15);
 
-      const colNames = Object.keys(DISPLAYED_DATA[0]).filter(k => k !== "__ms__");
+      const colNames = Object.keys(pdfRows[0]).filter(k => k !== "__ms__");
       let pdfBody = [];
-      DISPLAYED_DATA.forEach(r => {
+      pdfRows.forEach(r => {
         let row = colNames.map(c => (r[c] == null ? "" : ""+r[c]));
         pdfBody.push(row);
       });
@@ -1228,10 +1636,16 @@ document.addEventListener("DOMContentLoaded", function () {
 
   // Clear cache
   document.getElementById("clearCacheBtn").addEventListener("click", async ()=>{
+    if (activeFetchJob) {
+      cancelFetchJob(activeFetchJob);
+      activeFetchJob = null;
+    }
     await fetch("/clear_cache", { method:"POST" });
     selectedTags.clear();
-    WORKING_TABLE = [];
-    DISPLAYED_DATA = [];
+    WT_ROWS = 0;
+    WT_VERSION = null;
+    DISPLAYED_RANGE = null;
+    tableView = null;
     if (chart) { chart.destroy(); chart=null; }
     clearTable();
     logStatus("Cache cleared.");